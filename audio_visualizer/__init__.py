@@ -1,19 +1,19 @@
 import sys
-
-# Check if the --version flag is used and handle it directly
-if '--version' in sys.argv:
-    print("audio_visualizer 1.0.1")
-    sys.exit(0)
-
 from audio_visualizer.visualizer import AudioVisualizer
+from audio_visualizer.async_stream import SpectrumStream, spectrum_stream
+from audio_visualizer.pcm_source import SAMPLE_FORMATS
 import argparse
+import atexit
 import logging
 import logging.handlers
+import queue
 import time
 import os
 from sys import platform
 from lupa import LuaRuntime
 
+__all__ = ['AudioVisualizer', 'SpectrumStream', 'spectrum_stream', 'main']
+
 
 # Define a function to determine the appropriate log file path
 def get_log_path():
@@ -32,35 +32,78 @@ def get_log_path():
     return os.path.join(log_dir, "debug.log")
 
 
-# Configure logging
-log_file_path = get_log_path()
+def setup_logging():
+    """
+    Configures the root logger for the command line interface: every
+    record goes to the rotating debug log, and errors to the console too.
+    Importing the package leaves logging alone so that programs embedding
+    it keep their own configuration.
+
+    Returns:
+        QueueListener: The thread writing the records.
+    """
+    log_file_path = get_log_path()
+
+    # Clear existing handlers
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+
+    # Setup log rotation
+    logger = logging.getLogger()
+    handler = logging.handlers.RotatingFileHandler(
+        log_file_path, maxBytes=1048576, backupCount=5)  # 1 MB
+    formatter = logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s')
+    handler.setFormatter(formatter)
+
+    # Create a console handler to log ERROR
+    # and higher level messages to the console
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.ERROR)
+    console_formatter = logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s')
+    console_handler.setFormatter(console_formatter)
+
+    # Hand records to a background thread so that writing them never
+    # blocks the visualization; the queue is unbounded so a burst cannot
+    # either
+    log_queue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(
+        log_queue, handler, console_handler, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    # Get the root logger and add the queue handler
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG)
 
-# Clear existing handlers
-for handler in logging.root.handlers[:]:
-    logging.root.removeHandler(handler)
+    # Disable propagation for the logger to prevent duplicate logging in
+    # console
+    logger.propagate = False
+    return log_listener
 
-# Setup log rotation
-logger = logging.getLogger()
-handler = logging.handlers.RotatingFileHandler(
-    log_file_path, maxBytes=1048576, backupCount=5)  # 1 MB
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-handler.setFormatter(formatter)
-logger.addHandler(handler)
 
-# Create a console handler to log ERROR
-# and higher level messages to the console
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.ERROR)
-console_formatter = logging.Formatter(
-    '%(asctime)s - %(levelname)s - %(message)s')
-console_handler.setFormatter(console_formatter)
+def positive_int(value):
+    """
+    Parses a command line value that must be a positive integer.
 
-# Get the root logger and add the console handler
-logger.addHandler(console_handler)
-logger.setLevel(logging.DEBUG)
+    Args:
+        value (str): The value given on the command line.
 
-# Disable propagation for the logger to prevent duplicate logging in console
-logger.propagate = False
+    Returns:
+        int: The parsed value.
+
+    Raises:
+        argparse.ArgumentTypeError: if the value is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer, got {value}")
+    return number
 
 
 def load_config():
@@ -108,7 +151,8 @@ def load_config():
             'keys': {
                 'j': 'vertical',
                 'h': 'horizontal-ltr',
-                'l': 'horizontal-rtl'
+                'l': 'horizontal-rtl',
+                'k': 'waterfall'
             }
         },
         'settings': {
@@ -122,14 +166,20 @@ def load_config():
 
 def main():
     """Entry point for the audio visualizer command line interface."""
+    # Check if the --version flag is used and handle it directly
+    if '--version' in sys.argv:
+        print("audio_visualizer 1.0.1")
+        sys.exit(0)
+
+    setup_logging()
     config = load_config()
 
     parser = argparse.ArgumentParser(description="Terminal Audio Visualizer")
     parser.add_argument(
         "--mode",
-        choices=["vertical", "horizontal-ltr", "horizontal-rtl"],
+        choices=["vertical", "horizontal-ltr", "horizontal-rtl", "waterfall"],
         default=config['settings']['default_mode'],
-        help="Choose visualization mode: vertical or horizontal",
+        help="Choose visualization mode: vertical, horizontal or waterfall",
     )
     parser.add_argument(
         "--alpha",
@@ -149,6 +199,44 @@ def main():
         default=config['settings']['sample_rate'],
         help="Sampling rate; default is 44100",
     )
+    resolution = parser.add_mutually_exclusive_group()
+    resolution.add_argument(
+        "--max-freq",
+        type=float,
+        default=None,
+        help="Highest frequency to show in Hz; default is all of them",
+    )
+    resolution.add_argument(
+        "--octaves",
+        type=positive_int,
+        default=None,
+        help="Show log-spaced bands from this many octaves, each analyzed "
+             "at its own rate; default is a single FFT",
+    )
+    parser.add_argument(
+        "--source",
+        default=None,
+        help="Audio input device name, '-' for raw PCM audio on stdin or "
+             "'fifo:PATH' for raw PCM audio from a named pipe; default is "
+             "the configured audio_source",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(SAMPLE_FORMATS),
+        default='s16le',
+        help="Sample format of raw PCM input; default is s16le",
+    )
+    parser.add_argument(
+        "--channels",
+        type=int,
+        default=2,
+        help="Number of channels of raw PCM input; default is 2",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Capture and analyze audio in a separate process from drawing.",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -157,6 +245,11 @@ def main():
     )
     args = parser.parse_args()
 
+    audio_source = args.source or config['settings']['audio_source']
+    if args.processes and audio_source == '-':
+        # The analysis process does not inherit stdin
+        parser.error("--source - cannot be combined with --processes")
+
     visualizer = AudioVisualizer(
         mode=args.mode,
         alpha=args.alpha,
@@ -164,16 +257,25 @@ def main():
         rate=args.rate,
         key_binds=config['key_binds'],
         theme=config['themes'],
-        audio_source=config['settings']['audio_source']
+        audio_source=audio_source,
+        processes=args.processes,
+        max_freq=args.max_freq,
+        octaves=args.octaves,
+        channels=args.channels,
+        sample_format=args.format
     )
     visualizer.start()
 
     try:
-        while True:
+        while visualizer.is_running():
             time.sleep(1)  # Keep the main thread active
     except KeyboardInterrupt:
         visualizer.stop()
         print("Visualization stopped by user")
+        return
+    # The visualization stopped by itself after logging an error
+    visualizer.stop()
+    sys.exit(f"Visualization stopped after an error, see {get_log_path()}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,224 @@
+"""
+async_stream.py
+
+This module streams band spectra to asyncio consumers, for embedding the
+audio analysis in other programs without the terminal renderer.
+"""
+
+import asyncio
+import logging
+import time
+import numpy as np
+
+from audio_visualizer.pcm_source import open_source
+from audio_visualizer.visualizer_logic.audio_features import AudioFeatures
+from audio_visualizer.visualizer_logic.audio_processing import (
+    log_band_edges, reduce_bands
+)
+from audio_visualizer.visualizer_logic.spectrum_analyzer import (
+    SpectrumAnalyzer, frequency_bins
+)
+from audio_visualizer.visualizer_logic.gpu_config import (
+    computation_lib as xp
+)
+
+
+def to_read_only_numpy(array):
+    """
+    Copies an analysis result into a read-only NumPy array.
+
+    Args:
+        array (array): A NumPy or CuPy array.
+
+    Returns:
+        np.ndarray: A float32 array that consumers cannot modify.
+    """
+    if not isinstance(array, np.ndarray):
+        array = array.get()  # CuPy arrays are copied back from the GPU
+    frame = np.array(array, dtype=np.float32)
+    frame.setflags(write=False)
+    return frame
+
+
+class SpectrumStream:
+    """
+    A class to share one audio source between asyncio consumers.
+
+    Blocking reads and the FFT run in the event loop's default executor,
+    one at a time, so the loop is never blocked and no thread is started
+    per consumer. Each consumer gets a bounded queue; when a consumer
+    falls behind its oldest frames are dropped so that memory stays
+    bounded and the frames it receives stay current.
+
+    Attributes:
+        source (AudioCapture or PCMSource): Audio source with a
+        `read_data()` method.
+        owns_source (bool): Whether the source was opened by this stream.
+        bands (int): Number of bands per frame.
+        fps (float): Maximum number of frames per second.
+        alpha (float): Smoothing factor for the spectrum.
+        maxsize (int): Number of frames each consumer queue can hold.
+        window (np.array): Window function applied to the audio data.
+        edges (array): Band edges, relative to the first analyzed bin.
+        analyzer (SpectrumAnalyzer): Computes the bins within the bands;
+        a direct DFT is used instead of an FFT if that is faster, which
+        takes a narrow frequency range rather than few bands.
+        smoothed_fft (array): Smoothed spectrum carried between reads.
+        features (AudioFeatures): Level and beat features of the latest
+        read, e.g. `features.onset` and `features.bpm`.
+        queues (list): One asyncio.Queue per active consumer.
+        task (asyncio.Task): Task reading the source.
+    """
+
+    def __init__(self, source=None, bands=64, fps=60, alpha=0.4,
+                 chunk=2048, rate=44100, maxsize=2, min_freq=None,
+                 max_freq=None, channels=2, sample_format='s16le'):
+        """
+        Initializes the stream. Reading starts with the first consumer.
+
+        Args:
+            source (AudioCapture or str, optional): An audio source, or the
+            name of the input device to capture from; '-' reads raw PCM
+            audio from stdin and 'fifo:' and a path from a named pipe.
+            bands (int): Number of log-spaced bands per frame.
+            fps (float): Maximum number of frames per second.
+            alpha (float): Smoothing factor for the spectrum.
+            chunk (int): Number of audio samples per buffer when opening
+            a device.
+            rate (int): Sampling rate in Hz when opening a device.
+            maxsize (int): Number of frames each consumer queue can hold.
+            min_freq (float, optional): Lowest frequency of the bands in Hz.
+            max_freq (float, optional): Highest frequency of the bands in Hz.
+            channels (int): Number of channels of raw PCM input.
+            sample_format (str): Sample format of raw PCM input, e.g.
+            's16le'.
+        """
+        if source is None or isinstance(source, str):
+            source = open_source(source, chunk, rate, channels, sample_format)
+            self.owns_source = True
+        else:
+            self.owns_source = False
+        self.source = source
+        self.bands = bands
+        self.fps = fps
+        self.alpha = alpha
+        self.maxsize = maxsize
+        self.window = xp.hamming(source.CHUNK)
+        bins = frequency_bins(source.CHUNK, source.RATE, min_freq, max_freq)
+        edges = log_band_edges(int(bins[-1]) + 1, bands,
+                               low=max(int(bins[0]), 1))
+        self.analyzer = SpectrumAnalyzer(
+            self.window, np.arange(int(edges[0]), int(edges[-1])))
+        self.edges = edges - edges[0]
+        self.smoothed_fft = xp.zeros(len(self.analyzer.bins))
+        self.features = AudioFeatures(
+            source.RATE, self.window, self.analyzer.bins)
+        self.queues = []
+        self.task = None
+
+    def read_frame(self):
+        """
+        Reads one buffer from the source and reduces it to bands.
+        Runs in the executor.
+
+        Returns:
+            np.ndarray: Read-only band magnitudes scaled to 0-1,
+            or None if no audio data was available.
+        """
+        data = self.source.read_data()
+        if data is None:
+            return None
+        fft_data = self.analyzer(data)
+        self.features.update(fft_data)
+        self.smoothed_fft = (self.alpha * self.smoothed_fft
+                             + (1 - self.alpha) * fft_data)
+        band_data = reduce_bands(self.smoothed_fft, self.edges)
+        max_band = xp.max(band_data, initial=1)  # Avoid division by zero
+        return to_read_only_numpy(band_data / max_band)
+
+    async def run(self):
+        """
+        Reads frames and hands them to every consumer queue until no
+        consumer is left.
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.fps
+        last_frame = 0
+        # A consumer that subscribes while the source is being stopped
+        # still sees this task running, so the source is started again
+        while self.queues:
+            if self.owns_source:
+                await loop.run_in_executor(None, self.source.start_stream)
+            try:
+                while self.queues:
+                    frame = await loop.run_in_executor(
+                        None, self.read_frame)
+                    now = time.monotonic()
+                    if frame is None or now - last_frame < interval:
+                        continue
+                    last_frame = now
+                    for queue in self.queues:
+                        if queue.full():
+                            queue.get_nowait()  # Drop the oldest frame
+                        queue.put_nowait(frame)
+            except Exception as e:
+                logging.error(f"Error reading spectrum stream: {e}")
+                raise
+            finally:
+                if self.owns_source:
+                    await loop.run_in_executor(
+                        None, self.source.stop_stream)
+
+    async def subscribe(self):
+        """
+        Yields frames to one consumer until it stops iterating.
+
+        Yields:
+            np.ndarray: Read-only band magnitudes scaled to 0-1.
+        """
+        queue = asyncio.Queue(maxsize=self.maxsize)
+        self.queues.append(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    (getter, self.task), return_when=asyncio.FIRST_COMPLETED)
+                if getter not in done:
+                    getter.cancel()
+                    # Re-raise the error that stopped the reader
+                    self.task.result()
+                    return
+                yield getter.result()
+        finally:
+            self.queues.remove(queue)
+            if not self.queues and not self.task.done():
+                # The reader finishes its current read and stops
+                await asyncio.shield(self.task)
+
+    def __aiter__(self):
+        """Iterates over the stream as a single consumer."""
+        return self.subscribe()
+
+
+def spectrum_stream(source=None, bands=64, fps=60, **kwargs):
+    """
+    Streams band spectra from an audio source.
+
+    Example:
+        async for frame in spectrum_stream('BlackHole', bands=64, fps=60):
+            leds.show(frame)
+
+    Args:
+        source (AudioCapture or str, optional): An audio source, or the
+        name of the input device to capture from.
+        bands (int): Number of log-spaced bands per frame.
+        fps (float): Maximum number of frames per second.
+        **kwargs: Further arguments for SpectrumStream.
+
+    Returns:
+        async_generator: Yields read-only NumPy arrays of band magnitudes
+        scaled to 0-1.
+    """
+    return SpectrumStream(source, bands=bands, fps=fps, **kwargs).subscribe()
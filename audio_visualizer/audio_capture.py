@@ -7,6 +7,10 @@ This module captures audio from the microphone using PyAudio
 import pyaudio
 import logging
 import platform
+import re
+
+from audio_visualizer.backoff import Backoff
+from audio_visualizer.log_summary import EventSummary
 
 
 class AudioCapture:
@@ -21,6 +25,15 @@ class AudioCapture:
         audio_source (str): The name of the audio input device to use.
         audio (pyaudio.PyAudio): PyAudio object for audio streaming.
         stream (pyaudio.Stream): Stream object for audio input.
+        read_errors (EventSummary): Counts failed reads for periodic
+        logging instead of logging each one.
+        devices (dict): Cached device info, keyed by device index.
+        device_indexes (dict): Cached device indexes, keyed by device name.
+        devices_stale (bool): Whether the cache must be rebuilt before the
+        next device lookup.
+        backoff (Backoff): Waits between reopen attempts.
+        recovering (bool): Whether a lost stream is being reopened, when
+        failures to open it are counted instead of logged each time.
     """
 
     def __init__(self, chunk, rate, channels=2, device_name=None):
@@ -31,53 +44,124 @@ class AudioCapture:
         self.device_name = device_name
         self.audio = pyaudio.PyAudio()
         self.stream = None
+        self.read_errors = EventSummary()
+        self.devices = {}
+        self.device_indexes = {}
+        self.devices_stale = True
+        self.backoff = Backoff()
+        self.recovering = False
+
+    def log_failure(self, event, detail):
+        """
+        Logs a failure to open the stream, or counts it for periodic
+        logging while a lost stream is being reopened.
 
-    def start_stream(self):
+        Args:
+            event (str): Description of the failure.
+            detail (object): Detail such as the exception raised.
         """
-        Starts the audio stream. Selects the specified device if provided.
+        if self.recovering:
+            self.read_errors.record(event, detail)
+        else:
+            logging.error(f"{event}: {detail}")
+
+    def refresh_devices(self):
+        """
+        Enumerates the audio devices once into the device cache, logging
+        them when they differ from the previous enumeration.
+        """
+        previous = [info['name'] for info in self.devices.values()]
+        self.devices = {}
+        self.device_indexes = {}
+        for i in range(self.audio.get_device_count()):
+            info = self.audio.get_device_info_by_index(i)
+            self.devices[i] = info
+            self.device_indexes.setdefault(info['name'], i)
+        self.devices_stale = False
+
+        names = [info['name'] for info in self.devices.values()]
+        if names != previous:
+            for i, name in enumerate(names):
+                logging.info(f"Device {i}: {name}")
+
+    def find_device(self, name):
+        """
+        Looks up a device in the cache by name. An exact match is preferred
+        over a substring match; names starting with 're:' are matched as
+        regular expressions.
+
+        Args:
+            name (str): Name, part of a name, or 're:' and a pattern.
+
+        Returns:
+            int: The index of the first matching device, or None.
+        """
+        if self.devices_stale:
+            self.refresh_devices()
+
+        if name.startswith('re:'):
+            pattern = re.compile(name[3:])
+            matches = (i for i, info in self.devices.items()
+                       if pattern.search(info['name']))
+        elif name in self.device_indexes:
+            return self.device_indexes[name]
+        else:
+            matches = (i for i, info in self.devices.items()
+                       if name in info['name'])
+        return next(matches, None)
+
+    def resolve_device(self):
+        """
+        Chooses the input device: the specified device if provided,
+        BlackHole on macOS, and the default input device otherwise.
+
+        Returns:
+            int: The index of the device to open, or None if there is none.
         """
         device_index = None
 
-        logging.info(f"Specified device name {self.device_name}")
+        if not self.recovering:
+            logging.info(f"Specified device name {self.device_name}")
 
-        for i in range(self.audio.get_device_count()):
-            info = self.audio.get_device_info_by_index(i)
-            logging.info(f"Device {i}: {info['name']}")
+        if self.devices_stale:
+            self.refresh_devices()
 
-        # List available audio devices
         if self.device_name:
             # Attempt to find specified device
-            for i in range(self.audio.get_device_count()):
-                info = self.audio.get_device_info_by_index(i)
-                if self.device_name in info['name']:
-                    logging.info(f"Selected Device {i}: {info['name']}")
-                    device_index = i
-                    break
+            device_index = self.find_device(self.device_name)
             if device_index is None:
-                logging.error(f"Device '{self.device_name}' not found.")
+                self.log_failure("Device not found", self.device_name)
 
         if device_index is None and platform.system() == 'Darwin':
             # Specific handling for macOS
-            for i in range(self.audio.get_device_count()):
-                info = self.audio.get_device_info_by_index(i)
-                if 'BlackHole 2ch' in info['name']:
-                    logging.info(f"Selected Device {i}: {info['name']}")
-                    device_index = i
-                    break
+            device_index = self.find_device('BlackHole 2ch')
             if device_index is None:
-                logging.error(
-                    "BlackHole 2ch not found on this system.")
+                self.log_failure("Device not found", 'BlackHole 2ch')
+
+        if device_index is not None:
+            if not self.recovering:
+                logging.info(
+                    f"Selected Device {device_index}: {
+                        self.devices[device_index]['name']}")
+            return device_index
 
         # Use the default input device if no specific device name is provided
-        if device_index is None:
-            # Fallback to default input device
-            device_index = self.audio.get_default_input_device_info()[
-                'index']
-            default_device_info = self.audio.get_device_info_by_index(
-                device_index)
+        try:
+            default_device_info = self.audio.get_default_input_device_info()
+        except IOError as e:
+            self.log_failure("No default input device", e)
+            return None
+        if not self.recovering:
             logging.info(
                 f"No specific device selected, using default input device: {
                     default_device_info['name']}")
+        return default_device_info['index']
+
+    def start_stream(self):
+        """
+        Starts the audio stream. Selects the specified device if provided.
+        """
+        device_index = self.resolve_device()
 
         try:
             self.stream = self.audio.open(format=self.FORMAT,
@@ -87,24 +171,66 @@ class AudioCapture:
                                           input_device_index=device_index,
                                           frames_per_buffer=self.CHUNK)
         except Exception as e:
-            logging.error(f"Failed to open stream: {e}")
+            self.log_failure("Failed to open stream", e)
             self.stream = None
 
+    def recover_stream(self):
+        """
+        Reopens a failed stream after a delay that doubles with every
+        attempt until audio is read again. The device is resolved again
+        from the cache, which is rebuilt when the previous attempt failed
+        too, so the caller's state survives a device being unplugged and
+        plugged back in. Failed attempts are counted in read_errors rather
+        than logged one by one.
+        """
+        retrying = self.backoff.retrying
+        self.backoff.wait()
+        if retrying:
+            # Reinitialize PortAudio so it sees devices added since
+            self.audio.terminate()
+            self.audio = pyaudio.PyAudio()
+            self.devices_stale = True
+        self.recovering = True
+        try:
+            self.start_stream()
+        finally:
+            self.recovering = False
+        if self.stream is not None:
+            logging.info("Audio stream recovered")
+
+    def close_stream(self):
+        """
+        Closes the stream, ignoring errors from a stream that has failed.
+        """
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        except Exception as e:
+            logging.debug(f"Error closing stream: {e}")
+        self.stream = None
+
     def read_data(self):
         """
-        Reads audio data from the stream.
+        Reads audio data from the stream, reopening the stream if it
+        has failed.
 
         Returns:
-            bytes: The audio data.
+            bytes: The audio data, or None if no data could be read.
         """
-        if self.stream is not None:
-            try:
-                return self.stream.read(
-                    self.CHUNK, exception_on_overflow=False)
-            except IOError as e:
-                logging.warning(f"Input overflowed: {e}")
+        if self.stream is None:
+            self.read_errors.record("Read without an open stream")
+            self.recover_stream()
+            if self.stream is None:
                 return None
-        return None
+        try:
+            data = self.stream.read(
+                self.CHUNK, exception_on_overflow=False)
+            self.backoff.reset()
+            return data
+        except IOError as e:
+            self.read_errors.record("Read failed", e)
+            self.close_stream()
+            return None
 
     def stop_stream(self):
         """
@@ -114,3 +240,4 @@ class AudioCapture:
             self.stream.stop_stream()
             self.stream.close()
         self.audio.terminate()
+        self.read_errors.flush()
@@ -0,0 +1,46 @@
+"""
+backoff.py
+
+This module spaces out retries of an operation that keeps failing, such
+as reopening an audio source.
+"""
+
+import time
+
+
+class Backoff:
+    """
+    A class to wait between retries for twice as long as the previous
+    time, up to a limit, until an attempt succeeds.
+
+    Attributes:
+        min_delay (float): Seconds to wait before the first retry.
+        max_delay (float): Most seconds to wait before a retry.
+        delay (float): Seconds to wait before the next retry.
+    """
+
+    def __init__(self, min_delay=0.05, max_delay=1.0):
+        """
+        Initializes the backoff.
+
+        Args:
+            min_delay (float): Seconds to wait before the first retry.
+            max_delay (float): Most seconds to wait before a retry.
+        """
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min_delay
+
+    @property
+    def retrying(self):
+        """bool: Whether the previous retry failed too."""
+        return self.delay > self.min_delay
+
+    def wait(self):
+        """Waits before a retry and doubles the next wait."""
+        time.sleep(self.delay)
+        self.delay = min(self.delay * 2, self.max_delay)
+
+    def reset(self):
+        """Starts over from the shortest wait after a success."""
+        self.delay = self.min_delay
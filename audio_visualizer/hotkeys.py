@@ -0,0 +1,236 @@
+"""
+hotkeys.py
+
+This module reads mode-switching hotkeys from the controlling terminal
+instead of a system-wide keyboard hook.
+"""
+
+import logging
+import os
+import selectors
+import sys
+import time
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import termios
+    import tty
+
+# Scan codes Windows reports after a '\x00' prefix for 'alt' + letter
+WINDOWS_ALT_SCAN_CODES = {
+    'q': 0x10, 'w': 0x11, 'e': 0x12, 'r': 0x13, 't': 0x14, 'y': 0x15,
+    'u': 0x16, 'i': 0x17, 'o': 0x18, 'p': 0x19, 'a': 0x1e, 's': 0x1f,
+    'd': 0x20, 'f': 0x21, 'g': 0x22, 'h': 0x23, 'j': 0x24, 'k': 0x25,
+    'l': 0x26, 'z': 0x2c, 'x': 0x2d, 'c': 0x2e, 'v': 0x2f, 'b': 0x30,
+    'n': 0x31, 'm': 0x32
+}
+
+
+def encode_key(key, modifier):
+    """
+    Returns the character sequence the terminal sends when a key is
+    pressed together with the modifier key.
+
+    Args:
+        key (str): The bound key, e.g. 'j'.
+        modifier (str): The modifier key: 'ctrl', 'shift' or 'alt'.
+
+    Returns:
+        str: The sequence read from the terminal for the key combination.
+
+    Raises:
+        ValueError: if the modifier or key cannot be sent by a terminal.
+    """
+    if modifier == 'ctrl':
+        return chr(ord(key.lower()) & 0x1f)
+    elif modifier == 'shift':
+        return key.upper()
+    elif modifier == 'alt':
+        if os.name == 'nt':
+            if key.lower() not in WINDOWS_ALT_SCAN_CODES:
+                raise ValueError(f"Unsupported alt hotkey: {key}")
+            return '\x00' + chr(WINDOWS_ALT_SCAN_CODES[key.lower()])
+        return '\x1b' + key
+    else:
+        raise ValueError(f"Unsupported modifier key: {modifier}")
+
+
+def build_key_table(key_binds):
+    """
+    Resolves the configured key bindings into a lookup table keyed by
+    the sequences the terminal sends.
+
+    Args:
+        key_binds (dict): Configuration for key bindings with a
+        'modifier_key' and a 'keys' mapping of keys to modes.
+
+    Returns:
+        dict: Maps key sequences (str) to visualization modes (str).
+    """
+    modifier = key_binds['modifier_key']
+    table = {}
+    for key, mode in key_binds['keys'].items():
+        try:
+            table[encode_key(key, modifier)] = mode
+        except ValueError as e:
+            logging.error(f"Ignoring hotkey {modifier}+{key}: {e}")
+    return table
+
+
+def split_key_sequences(text):
+    """
+    Splits the characters read from the terminal into key sequences.
+
+    Escape sequences (alt + key, arrow and function keys) are kept
+    together so that their trailing characters are not mistaken
+    for plain key presses.
+
+    Args:
+        text (str): Characters read from the terminal.
+
+    Returns:
+        list: The key sequences (str) in the order they were pressed.
+    """
+    sequences = []
+    i = 0
+    while i < len(text):
+        if text[i] in '\x1b\x00\xe0' and i + 1 < len(text):
+            end = i + 2
+            if text[i] == '\x1b' and text[i + 1] in '[O':
+                # CSI/SS3 sequences end with a byte in the range '@'-'~'
+                while end < len(text) and not '@' <= text[end] <= '~':
+                    end += 1
+                end = min(end + 1, len(text))
+            sequences.append(text[i:end])
+            i = end
+        else:
+            sequences.append(text[i])
+            i += 1
+    return sequences
+
+
+class TerminalHotkeys:
+    """
+    A class to read hotkeys from the controlling terminal.
+
+    The terminal is put into cbreak mode so key presses are available
+    immediately and are not echoed. Keys are read while the render loop
+    waits between frames, so no extra listener thread is needed.
+
+    Attributes:
+        key_table (dict): Maps key sequences to visualization modes.
+        on_hotkey (function): Called with the mode of a pressed hotkey.
+        fd (int): File descriptor of the controlling terminal.
+        owns_fd (bool): Whether fd was opened here and must be closed.
+        saved_attributes (list): Terminal attributes to restore on stop.
+        selector (selectors.BaseSelector): Waits for terminal input.
+    """
+
+    def __init__(self, key_binds, on_hotkey):
+        """
+        Initializes the hotkey reader.
+
+        Args:
+            key_binds (dict): Configuration for key bindings.
+            on_hotkey (function): Callback taking the new mode (str).
+        """
+        self.key_table = build_key_table(key_binds)
+        self.on_hotkey = on_hotkey
+        self.fd = None
+        self.owns_fd = False
+        self.saved_attributes = None
+        self.selector = None
+
+    def start(self):
+        """
+        Puts the controlling terminal into cbreak mode. Hotkeys are
+        disabled if there is no terminal to read from.
+        """
+        if os.name == 'nt':
+            if sys.stdin.isatty():
+                self.fd = sys.stdin.fileno()
+                logging.info("Terminal hotkeys started")
+            else:
+                logging.info("No console attached, hotkeys disabled")
+            return
+
+        try:
+            if sys.stdin.isatty():
+                self.fd = sys.stdin.fileno()
+            else:
+                # stdin may carry audio, so fall back to the controlling tty
+                self.fd = os.open('/dev/tty', os.O_RDONLY | os.O_NONBLOCK)
+                self.owns_fd = True
+            self.saved_attributes = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.fd, selectors.EVENT_READ)
+            logging.info("Terminal hotkeys started")
+        except (OSError, termios.error) as e:
+            logging.info(f"No controlling terminal, hotkeys disabled: {e}")
+            self.close_fd()
+
+    def wait(self, timeout):
+        """
+        Waits for the given time while handling any hotkeys pressed.
+        Used in place of a sleep by the render loop.
+
+        Args:
+            timeout (float): Number of seconds to wait.
+        """
+        if self.fd is None:
+            time.sleep(timeout)
+            return
+
+        deadline = time.monotonic() + timeout
+        remaining = timeout
+        while remaining > 0:
+            if os.name == 'nt':
+                text = ''
+                while msvcrt.kbhit():
+                    text += msvcrt.getwch()
+                if not text:
+                    time.sleep(min(remaining, 0.01))
+            else:
+                text = ''
+                if self.selector.select(remaining):
+                    try:
+                        text = os.read(self.fd, 64).decode(errors='ignore')
+                    except BlockingIOError:
+                        pass
+            if text:
+                self.dispatch(text)
+            remaining = deadline - time.monotonic()
+
+    def dispatch(self, text):
+        """
+        Calls the hotkey callback for each bound key sequence in the text.
+
+        Args:
+            text (str): Characters read from the terminal.
+        """
+        for sequence in split_key_sequences(text):
+            mode = self.key_table.get(sequence)
+            if mode:
+                logging.debug(f"Hotkey {sequence!r} is pressed")
+                self.on_hotkey(mode)
+
+    def stop(self):
+        """Restores the terminal attributes saved when starting."""
+        if self.selector is not None:
+            self.selector.close()
+            self.selector = None
+        if self.saved_attributes is not None:
+            termios.tcsetattr(
+                self.fd, termios.TCSADRAIN, self.saved_attributes)
+            self.saved_attributes = None
+        self.close_fd()
+        logging.info("Terminal hotkeys stopped")
+
+    def close_fd(self):
+        """Closes the terminal file descriptor if it was opened here."""
+        if self.owns_fd:
+            os.close(self.fd)
+            self.owns_fd = False
+        self.fd = None
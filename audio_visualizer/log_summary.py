@@ -0,0 +1,64 @@
+"""
+log_summary.py
+
+This module aggregates events that can repeat on every frame into
+periodic summary log messages.
+"""
+
+import logging
+import time
+
+
+class EventSummary:
+    """
+    A class to count repeated events and log them as one summary per
+    interval, so that a burst costs one log record rather than one per
+    frame.
+
+    Attributes:
+        level (int): Logging level of the summaries.
+        interval (float): Minimum number of seconds between summaries.
+        counts (dict): Number of times each event occurred since the
+        last summary.
+        details (dict): Detail of the most recent occurrence of each event.
+        last_flush (float): Time of the last summary.
+    """
+
+    def __init__(self, level=logging.WARNING, interval=5.0):
+        """
+        Initializes the summary.
+
+        Args:
+            level (int): Logging level of the summaries.
+            interval (float): Minimum number of seconds between summaries.
+        """
+        self.level = level
+        self.interval = interval
+        self.counts = {}
+        self.details = {}
+        self.last_flush = time.monotonic()
+
+    def record(self, event, detail=None):
+        """
+        Counts an occurrence of an event, logging a summary if the
+        interval has passed.
+
+        Args:
+            event (str): Description of the event, e.g. 'Input overflowed'.
+            detail (object, optional): Detail such as the exception raised.
+        """
+        self.counts[event] = self.counts.get(event, 0) + 1
+        self.details[event] = detail
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Logs the counts since the last summary and resets them."""
+        now = time.monotonic()
+        for event, count in self.counts.items():
+            logging.log(self.level, "%s %d times in the last %.1fs: %s",
+                        event, count, now - self.last_flush,
+                        self.details[event])
+        self.counts.clear()
+        self.details.clear()
+        self.last_flush = now
@@ -0,0 +1,272 @@
+"""
+pcm_source.py
+
+This module reads raw PCM audio from stdin or a named pipe, e.g. the
+output of `parec` or `ffmpeg -f s16le -`, for hosts without an audio
+device, and opens the audio source named in the settings.
+"""
+
+import io
+import logging
+import os
+import selectors
+import sys
+import numpy as np
+
+from audio_visualizer.backoff import Backoff
+from audio_visualizer.log_summary import EventSummary
+
+# Sample dtype, offset of silence and scale to the 16-bit range
+SAMPLE_FORMATS = {
+    's16le': ('<i2', 0, 1),
+    's32le': ('<i4', 0, 2 ** -16),
+    'f32le': ('<f4', 0, 32768),
+    'u8': ('u1', 128, 256),
+}
+
+
+class PCMSource:
+    """
+    A class to read raw interleaved PCM audio from a pipe.
+
+    The pipe is read without blocking, with one large `readinto` into a
+    preallocated buffer for everything that has arrived, and chunks are
+    returned as views of that buffer rather than copies. Like the input
+    buffer of a device, audio that was not read in time is dropped, so
+    that the newest complete chunk is always the one returned.
+
+    Attributes:
+        path (str): Path of the named pipe, or '-' for stdin.
+        CHUNK (int): Number of audio samples per buffer.
+        RATE (int): Sample rate (samples per second).
+        CHANNELS (int): Number of interleaved audio channels.
+        sample_format (str): One of SAMPLE_FORMATS.
+        dtype (np.dtype): Type of one sample.
+        chunk_bytes (int): Number of bytes in one chunk.
+        buffer (bytearray): Bytes read from the pipe.
+        view (memoryview): View of the buffer to read into.
+        start (int): Offset of the first unread byte in the buffer.
+        end (int): Offset after the last byte read into the buffer.
+        timeout (float): Seconds a read waits for a chunk to arrive.
+        file (io.FileIO): The open pipe, or None.
+        selector (selectors.BaseSelector): Waits for the pipe to be
+        readable.
+        read_errors (EventSummary): Counts failed reads for periodic
+        logging instead of logging each one.
+        backoff (Backoff): Waits before reading again after the end of
+        the stream or a failure.
+    """
+
+    def __init__(self, path, chunk, rate, channels=2, sample_format='s16le',
+                 buffer_chunks=8, timeout=0.5):
+        """
+        Initializes the source. Reading starts with start_stream().
+
+        Args:
+            path (str): Path of the named pipe, or '-' for stdin.
+            chunk (int): Number of audio samples per buffer.
+            rate (int): Sampling rate of the audio in Hz.
+            channels (int): Number of interleaved audio channels.
+            sample_format (str): One of SAMPLE_FORMATS, e.g. 's16le'.
+            buffer_chunks (int): Size of the read buffer in chunks; at
+            least 2.
+            timeout (float): Seconds a read waits for a chunk to arrive.
+
+        Raises:
+            ValueError: if the sample format is not supported.
+        """
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}")
+        self.path = path
+        self.CHUNK = chunk
+        self.RATE = rate
+        self.CHANNELS = channels
+        self.sample_format = sample_format
+        self.dtype = np.dtype(SAMPLE_FORMATS[sample_format][0])
+        self.chunk_bytes = chunk * channels * self.dtype.itemsize
+        self.buffer = bytearray(max(buffer_chunks, 2) * self.chunk_bytes)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+        self.timeout = timeout
+        self.file = None
+        self.selector = None
+        self.read_errors = EventSummary()
+        self.backoff = Backoff()
+
+    def start_stream(self):
+        """
+        Opens the pipe for non-blocking reads.
+        """
+        try:
+            if self.path == '-':
+                fd = sys.stdin.fileno()
+                os.set_blocking(fd, False)
+                self.file = io.FileIO(fd, 'rb', closefd=False)
+            else:
+                # Opening without blocking does not wait for a writer
+                fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+                self.file = io.FileIO(fd, 'rb')
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.file, selectors.EVENT_READ)
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to open {self.path}: {e}")
+            self.file = None
+            return
+        logging.info(f"Reading {self.sample_format} audio with {
+            self.CHANNELS} channels from {self.path}")
+
+    def compact(self):
+        """
+        Moves the unread bytes to the front of the buffer, dropping all
+        complete chunks but the newest.
+        """
+        unread = self.end - self.start
+        dropped = max(unread // self.chunk_bytes - 1, 0) * self.chunk_bytes
+        self.start += dropped
+        unread -= dropped
+        self.buffer[:unread] = self.buffer[self.start:self.end]
+        self.start = 0
+        self.end = unread
+
+    def fill(self):
+        """
+        Reads everything that has arrived in the pipe into the buffer.
+
+        Returns:
+            int: The number of bytes read, 0 at the end of the stream or
+            None if nothing has arrived.
+        """
+        total = None
+        while True:
+            if self.end == len(self.buffer):
+                self.compact()
+            count = self.file.readinto(self.view[self.end:])
+            if count is None:
+                return total
+            if count == 0:
+                return total or 0
+            self.end += count
+            total = (total or 0) + count
+
+    def wait_for_data(self):
+        """
+        Waits until the pipe has data.
+
+        Returns:
+            bool: Whether the pipe became readable within the timeout.
+        """
+        return bool(self.selector.select(self.timeout))
+
+    def back_off(self, event, detail=None):
+        """
+        Records a failed read and waits, for twice as long as the
+        previous time, until the next read.
+
+        Args:
+            event (str): Description of the failure.
+            detail (object, optional): Detail such as the exception raised.
+        """
+        self.read_errors.record(event, detail)
+        self.backoff.wait()
+
+    def convert(self, data):
+        """
+        Converts a chunk of raw bytes to samples at the 16-bit scale.
+
+        Args:
+            data (memoryview): One chunk of the buffer.
+
+        Returns:
+            np.ndarray: One row per frame and one column per channel;
+            a view of the buffer for 16-bit audio.
+        """
+        samples = np.frombuffer(data, dtype=self.dtype)
+        _, offset, scale = SAMPLE_FORMATS[self.sample_format]
+        if offset or scale != 1:
+            samples = (samples.astype(np.float32) - offset) * scale
+        return samples.reshape(-1, self.CHANNELS)
+
+    def read_data(self):
+        """
+        Reads the newest complete chunk, waiting for one if needed.
+
+        The result is only valid until the next call, which may overwrite
+        the buffer it points into.
+
+        Returns:
+            np.ndarray: The audio samples, or None if no data could be read.
+        """
+        if self.file is None:
+            self.back_off("Read without an open stream")
+            self.start_stream()
+            return None
+
+        try:
+            while self.end - self.start < self.chunk_bytes:
+                count = self.fill()
+                if count == 0:
+                    # A named pipe stays readable until a writer returns
+                    self.back_off("End of stream")
+                    return None
+                if count is None and not self.wait_for_data():
+                    return None
+        except OSError as e:
+            self.back_off("Read failed", e)
+            return None
+        self.backoff.reset()
+
+        # Skip audio that is older than the newest complete chunk
+        unread = self.end - self.start
+        self.start += (unread // self.chunk_bytes - 1) * self.chunk_bytes
+        data = self.view[self.start:self.start + self.chunk_bytes]
+        self.start += self.chunk_bytes
+        return self.convert(data)
+
+    def stop_stream(self):
+        """
+        Closes the pipe, or hands stdin back in blocking mode.
+        """
+        if self.file is not None:
+            self.selector.close()
+            if self.path == '-':
+                os.set_blocking(self.file.fileno(), True)
+            self.file.close()
+            self.file = None
+        self.read_errors.flush()
+
+
+def open_source(source, chunk, rate, channels=2, sample_format='s16le'):
+    """
+    Opens the audio source named in the settings, without starting it.
+
+    Args:
+        source (str): '-' for raw PCM on stdin, 'fifo:' and the path of
+        a named pipe, or the name of the input device to capture from;
+        None captures from the default device.
+        chunk (int): Number of audio samples per buffer.
+        rate (int): Sampling rate of the audio in Hz.
+        channels (int): Number of channels of raw PCM input.
+        sample_format (str): One of SAMPLE_FORMATS, for raw PCM input.
+
+    Returns:
+        PCMSource or AudioCapture: The audio source.
+
+    Raises:
+        ImportError: if a device is named but PyAudio is not installed.
+    """
+    if source == '-':
+        return PCMSource('-', chunk, rate, channels, sample_format)
+    if source and source.startswith('fifo:'):
+        return PCMSource(source[len('fifo:'):], chunk, rate, channels,
+                         sample_format)
+    # Only import PyAudio when capturing from a device
+    try:
+        from audio_visualizer.audio_capture import AudioCapture
+    except ImportError as e:
+        raise ImportError(
+            "Capturing from an audio device needs PyAudio: pip install "
+            "audio_visualizer[device], or pipe raw PCM audio in with "
+            "--source - or --source fifo:PATH") from e
+    return AudioCapture(chunk=chunk, rate=rate, channels=2,
+                        device_name=source)
@@ -1,23 +1,117 @@
 import numpy as np
 import logging
+import logging.handlers
+import multiprocessing
 import os
-from pynput import keyboard
+import sys
 from threading import Thread, Event
 
-from audio_visualizer.audio_capture import AudioCapture
+from audio_visualizer.hotkeys import TerminalHotkeys
+from audio_visualizer.pcm_source import open_source
+from audio_visualizer.visualizer_logic.audio_features import AudioFeatures
 from audio_visualizer.visualizer_logic.audio_processing import (
-    process_audio_visualization
+    analyze_into_ring, process_audio_visualization, process_ring_visualization
 )
+from audio_visualizer.visualizer_logic.multires_analyzer import (
+    MultiResolutionAnalyzer
+)
+from audio_visualizer.visualizer_logic.spectrum_analyzer import (
+    SpectrumAnalyzer, frequency_bins
+)
+from audio_visualizer.visualizer_logic.spectrum_ring import SpectrumRing
 from audio_visualizer.visualizer_logic.visualizer_drawer import (
-    draw_horizontal_ltr, draw_horizontal_rtl, draw_vertical
+    WaterfallDrawer, draw_horizontal_ltr, draw_horizontal_rtl, draw_vertical
 )
 
 
 def clear_screen():
-    """Clears the console screen."""
+    """Clears the console screen and resets its scroll region."""
+    print('\033[r', end='', flush=True)
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
+def create_analyzer(window, rate, max_freq=None, octaves=None):
+    """
+    Creates the analyzer computing the values that are shown.
+
+    Args:
+        window (np.array): Window function to apply the audio data.
+        rate (int): Sampling rate of the audio in Hz.
+        max_freq (float, optional): Highest frequency to show in Hz.
+        octaves (int, optional): Number of octaves of a multi-resolution
+        analysis; defaults to a single FFT.
+
+    Returns:
+        SpectrumAnalyzer or MultiResolutionAnalyzer: The analyzer.
+    """
+    if octaves is not None:
+        return MultiResolutionAnalyzer(rate, octaves=octaves)
+    return SpectrumAnalyzer(
+        window, frequency_bins(len(window), rate, max_freq=max_freq))
+
+
+def run_analysis_process(ring_name, chunk, rate, alpha, device_name,
+                         stop_event, max_freq=None, octaves=None,
+                         channels=2, sample_format='s16le', log_queue=None,
+                         log_level=logging.DEBUG):
+    """
+    Captures and analyzes audio in a separate process, writing the
+    spectra to a shared ring.
+
+    Args:
+        ring_name (str): Name of the shared memory block of the ring.
+        chunk (int): Number of audio samples per buffer.
+        rate (int): Sampling rate of the audio in Hz.
+        alpha (float): Smoothing factor for visualization.
+        device_name (str): The name of the audio input device to use,
+        or 'fifo:' and the path of a named pipe of raw PCM audio.
+        stop_event (multiprocessing.Event): Event to signal the process
+        to stop.
+        max_freq (float, optional): Highest frequency to analyze in Hz.
+        octaves (int, optional): Number of octaves of a multi-resolution
+        analysis; defaults to a single FFT.
+        channels (int): Number of channels of raw PCM input.
+        sample_format (str): Sample format of raw PCM input.
+        log_queue (multiprocessing.Queue, optional): Queue handing log
+        records to the parent process.
+        log_level (int): Level of the root logger in this process.
+    """
+    if log_queue is not None:
+        # Send records back to the parent, which writes them with its own
+        # handlers
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(log_level)
+
+    window = np.hamming(chunk)
+    analyzer = create_analyzer(window, rate, max_freq, octaves)
+    ring = SpectrumRing.attach(ring_name, len(analyzer))
+    stream = None
+    try:
+        stream = open_source(device_name, chunk, rate, channels,
+                             sample_format)
+        stream.start_stream()
+        analyze_into_ring(stream=stream,
+                          chunk=chunk,
+                          alpha=alpha,
+                          window=window,
+                          stop_event=stop_event,
+                          ring=ring,
+                          analyzer=analyzer)
+    except KeyboardInterrupt:
+        pass  # Ctrl+C reaches the whole process group; the parent stops us
+    except Exception as e:
+        # The renderer notices the exit code and stops
+        logging.error(f"Audio analysis failed: {e}")
+        sys.exit(1)
+    finally:
+        if stream is not None:
+            stream.stop_stream()
+        ring.close()
+
+
 def get_visualization_function(mode):
     """
     Returns the visualization function based on the provided mode.
@@ -37,6 +131,9 @@ def get_visualization_function(mode):
         return draw_horizontal_ltr
     elif mode == 'horizontal-rtl':
         return draw_horizontal_rtl
+    elif mode == 'waterfall':
+        # A new drawer starts with a full redraw of the screen
+        return WaterfallDrawer()
     else:
         raise ValueError("Unsupported visualization mode: {mode}")
 
@@ -50,14 +147,36 @@ class AudioVisualizer:
         alpha (float): Alpha parameter for visualization smoothing.
         chunk (int): Number of audio samples per buffer.
         rate (int): Sample rate (samples per second).
-        stream (AudioCapture): Audio stream for capturing audio data.
+        stream (AudioCapture or PCMSource): Audio stream for capturing
+        audio data.
         thread (Thread): Thread running the visualization process.
         stop_event (Event): Event to signal the thread to stop.
+        draw_function (function): Drawing function for the current mode.
+        hotkeys (TerminalHotkeys): Reads mode-switching hotkeys.
+        features (AudioFeatures): Level and beat features of the audio.
+        processes (bool): Whether capture and analysis run in a separate
+        process from rendering.
+        ring (SpectrumRing): Spectra shared with the analysis process.
+        analysis_process (Process): Process capturing and analyzing audio.
+        process_stop_event (multiprocessing.Event): Event to signal the
+        analysis process to stop.
+        log_queue (multiprocessing.Queue): Log records of the analysis
+        process.
+        log_listener (QueueListener): Logs the records of the analysis
+        process in this process.
+        max_freq (float): Highest frequency shown in Hz, or None for all.
+        octaves (int): Number of octaves of the multi-resolution analysis,
+        or None for a single FFT.
+        window (np.array): Window function applied to the audio data.
+        bins (np.array): Indexes of the FFT bins shown.
+        analyzer (SpectrumAnalyzer or MultiResolutionAnalyzer): Computes
+        the bins or bands that are shown.
     """
 
     def __init__(
         self, mode, alpha, chunk, rate,
-            key_binds, theme=None, audio_source=None):
+            key_binds, theme=None, audio_source=None, processes=False,
+            max_freq=None, octaves=None, channels=2, sample_format='s16le'):
         """
         Initializes the AudioVisualizer object with default settings
         for audio streaming.
@@ -68,6 +187,17 @@ class AudioVisualizer:
             chunk (int): Number of audio samples per buffer.
             rate (int): Sampling rate of the audio in Hz.
             key_binds (dict, optional): Configuration for key bindings.
+            audio_source (str, optional): The name of the audio input
+            device, '-' to read raw PCM audio from stdin or 'fifo:' and
+            the path of a named pipe to read it from.
+            processes (bool, optional): Capture and analyze audio in a
+            separate process, exchanging spectra through shared memory.
+            max_freq (float, optional): Highest frequency to show in Hz.
+            octaves (int, optional): Show log-spaced bands from this many
+            octaves, each analyzed at its own rate, instead of FFT bins.
+            channels (int, optional): Number of channels of raw PCM input.
+            sample_format (str, optional): Sample format of raw PCM input,
+            e.g. 's16le'.
         """
         self.mode = mode
         self.alpha = alpha
@@ -76,13 +206,42 @@ class AudioVisualizer:
         self.key_binds = key_binds
         self.theme = theme or None
         self.device_name = audio_source or None
-        self.stream = AudioCapture(
-            chunk=self.chunk, rate=self.rate, channels=2,
-            device_name=self.device_name)
-        self.stream.start_stream()
+        self.processes = processes
+        self.max_freq = max_freq
+        self.octaves = octaves
+        self.channels = channels
+        self.sample_format = sample_format
+        self.window = np.hamming(self.chunk)
+        self.bins = frequency_bins(self.chunk, self.rate, max_freq=max_freq)
+        self.analyzer = None
+        self.ring = None
+        self.analysis_process = None
+        self.process_stop_event = None
+        self.log_queue = None
+        self.log_listener = None
+        if self.processes:
+            # The analysis process opens its own stream
+            self.stream = None
+        else:
+            self.stream = open_source(
+                self.device_name, self.chunk, self.rate, self.channels,
+                self.sample_format)
+            self.stream.start_stream()
         self.thread = None
         self.stop_event = Event()
-        self.modifier_pressed = False  # State flag for modifier key
+        self.draw_function = get_visualization_function(self.mode)
+        self.hotkeys = None
+        if not self.processes or self.octaves is not None:
+            # The bands also size the ring shared with an analysis process
+            self.analyzer = create_analyzer(
+                self.window, self.rate, max_freq, octaves)
+        if self.octaves is not None:
+            self.features = AudioFeatures(
+                self.rate, self.analyzer.window,
+                freqs=self.analyzer.freqs,
+                power_weights=self.analyzer.power_weights)
+        else:
+            self.features = AudioFeatures(self.rate, self.window, self.bins)
         self.setup_hotkeys()
         logging.info(
             f"Audio Visualizer initialized with mode: {self.mode}, alpha: {
@@ -91,73 +250,48 @@ class AudioVisualizer:
 
     def setup_hotkeys(self):
         """
-        Sets up the keyboard listener
+        Sets up the terminal hotkey reader
         for hotkeys to change visualization modes.
         """
-        listener = keyboard.Listener(
-            on_press=self.on_key_press, on_release=self.on_key_release)
-        listener.start()
-        logging.info("Keyboard listener started")
+        self.hotkeys = TerminalHotkeys(self.key_binds, self.change_mode)
+        self.hotkeys.start()
 
-    def on_key_press(self, key):
+    def change_mode(self, new_mode):
         """
-        Handles key press events to change visualization modes based
-        on on configured keybindings.
+        Change the mode of the visualizer. The running visualization
+        picks up the new drawing function on its next frame.
 
         Args:
-            key (Key): The key that was pressed.
+            new_mode (str): The new visualization mode to set.
         """
+        if new_mode == self.mode:
+            return
         try:
-            if isinstance(key, keyboard.Key):
-                modifier_keys = [getattr(keyboard.Key,
-                                         f'{self.key_binds[
-                                             "modifier_key"]}_l'),
-                                 getattr(keyboard.Key,
-                                         f'{self.key_binds["modifier_key"]}_r')
-                                 ]
-                if key in modifier_keys:
-                    self.modifier_pressed = True
-
-            if isinstance(key, keyboard.KeyCode) and self.modifier_pressed:
-                if key.char in self.key_binds['keys']:
-                    logging.debug(f"{key.char} is pressed")
-                    new_mode = self.key_binds['keys'][key.char]
-                    if new_mode and new_mode != self.mode:
-                        self.change_mode(new_mode)
-        except Exception as e:
-            logging.error(f"Error handling key press: {e}")
+            self.draw_function = get_visualization_function(new_mode)
+        except ValueError as e:
+            logging.error(f"Error changing mode: {e}")
+            return
+        logging.info(f"Changing mode from {
+            self.mode} to {new_mode}")
+        self.mode = new_mode
 
-    def on_key_release(self, key):
+    def draw_frame(self, frame_buffer, cols, rows, scaled_fft):
         """
-        Manages the state of the Ctrl key upon its release.
+        Draws a frame with the drawing function of the current mode.
 
         Args:
-            key (Key): The key that was released.
-        """
-        try:
-            modifier_keys = [getattr(keyboard.Key,
-                                     f'{self.key_binds["modifier_key"]}_l'),
-                             getattr(keyboard.Key,
-                                     f'{self.key_binds["modifier_key"]}_r')]
-            if key in modifier_keys:
-                self.modifier_pressed = False
-        except Exception as e:
-            logging.error(f"Error handling key release: {e}")
+            frame_buffer (list): The buffer where the frame data is stored.
+            cols (int): The number of columns in the terminal.
+            rows (int): The number of rows in the terminal.
+            scaled_fft (array): The scaled FFT data.
 
-    def change_mode(self, new_mode):
+        Returns:
+            str: Output of incremental drawers, None otherwise.
         """
-        Change the mode of the visualizer and restart visualization.
-
-        Args:
-            new_mode (str): The new visualization mode to set.
-        """
-        logging.info(f"Changing mode from {
-            self.mode} to {new_mode}")
-        self.mode = new_mode
-        self.restart_visualization()
+        return self.draw_function(frame_buffer, cols, rows, scaled_fft)
 
     def restart_visualization(self):
-        """Restart the visualization when the mode is changed."""
+        """Start the visualization thread, stopping a running one first."""
         if self.thread is not None and self.thread.is_alive():
             self.stop_event.set()
             self.thread.join()
@@ -169,22 +303,80 @@ class AudioVisualizer:
     def run_visualization(self):
         """Run the visualization in a separate thread to keep UI responsive."""
         try:
-            drawing_function = get_visualization_function(self.mode)
-            process_audio_visualization(stream=self.stream,
-                                        chunk=self.chunk,
-                                        rate=self.rate,
-                                        alpha=self.alpha,
-                                        window=np.hamming(self.chunk),
-                                        stop_event=self.stop_event,
-                                        draw_function=drawing_function,
-                                        theme=self.theme
-                                        )
+            if self.processes:
+                process_ring_visualization(ring=self.ring,
+                                           stop_event=self.stop_event,
+                                           draw_function=self.draw_frame,
+                                           theme=self.theme,
+                                           wait_function=self.hotkeys.wait,
+                                           producer=self.analysis_process
+                                           )
+            else:
+                process_audio_visualization(stream=self.stream,
+                                            chunk=self.chunk,
+                                            rate=self.rate,
+                                            alpha=self.alpha,
+                                            window=self.window,
+                                            stop_event=self.stop_event,
+                                            draw_function=self.draw_frame,
+                                            theme=self.theme,
+                                            wait_function=self.hotkeys.wait,
+                                            features=self.features,
+                                            analyzer=self.analyzer
+                                            )
         except Exception as e:
             logging.error(f"Error during visualization: {e}")
 
+    def is_running(self):
+        """
+        Tells whether the visualization is still running.
+
+        Returns:
+            bool: False once the visualization thread has stopped, e.g.
+            because the analysis process exited.
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def start_analysis_process(self):
+        """Start capturing and analyzing audio in a separate process."""
+        self.ring = SpectrumRing.create(
+            len(self.bins) if self.octaves is None else len(self.analyzer))
+        # Spawn rather than fork: a forked child would inherit the logging
+        # queue and its locks without the thread writing it
+        context = multiprocessing.get_context('spawn')
+        self.process_stop_event = context.Event()
+        self.log_queue = context.Queue()
+        # The root logger handles the child's records like its own
+        self.log_listener = logging.handlers.QueueListener(
+            self.log_queue, logging.getLogger())
+        self.log_listener.start()
+        self.analysis_process = context.Process(
+            target=run_analysis_process,
+            args=(self.ring.shm.name, self.chunk, self.rate, self.alpha,
+                  self.device_name, self.process_stop_event, self.max_freq,
+                  self.octaves, self.channels, self.sample_format,
+                  self.log_queue, logging.getLogger().level),
+            daemon=True)
+        self.analysis_process.start()
+        logging.info(
+            f"Analysis process started with pid {self.analysis_process.pid}")
+
+    def stop_analysis_process(self):
+        """Stop the analysis process and free the shared ring."""
+        self.process_stop_event.set()
+        self.analysis_process.join()
+        # Log the records the process sent before it stopped
+        self.log_listener.stop()
+        self.log_queue.close()
+        self.ring.close()
+        self.ring.unlink()
+        logging.info("Analysis process stopped.")
+
     def start(self):
         """Start the initial visualization."""
         logging.info("Starting visualization.")
+        if self.processes:
+            self.start_analysis_process()
         self.restart_visualization()
 
     def stop(self):
@@ -192,5 +384,8 @@ class AudioVisualizer:
         if self.thread and self.thread.is_alive():
             self.stop_event.set()
             self.thread.join()
+        if self.analysis_process is not None:
+            self.stop_analysis_process()
+        self.hotkeys.stop()
         clear_screen()
         logging.info("Visualization stopped.")
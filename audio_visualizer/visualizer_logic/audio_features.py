@@ -0,0 +1,145 @@
+import time
+import numpy as np
+from .gpu_config import computation_lib as xp
+
+
+class AudioFeatures:
+    """
+    A class to extract level and beat features from the magnitude
+    spectrum already computed for the visualization.
+
+    Every update costs a few vectorized passes over the spectrum and
+    keeps only fixed-size history, so it can run on every frame. When only
+    some bins are analyzed, the features describe that frequency range.
+
+    Attributes:
+        freqs (array): Center frequency of each analyzed bin or band in Hz.
+        power_weights (array): Times each bin's power counts in the total;
+        a real FFT holds every bin but DC and Nyquist twice. For bands of
+        averaged bins, the level is approximate.
+        power_scale (float): Converts the summed bin power to mean
+        sample power, undoing the FFT length and the window gain.
+        threshold_factor (float): Standard deviations above the mean
+        flux an onset must reach.
+        min_onset_interval (float): Seconds to ignore after an onset.
+        previous (array): Log-compressed spectrum of the previous frame.
+        flux_history (np.array): Ring buffer of recent flux values.
+        onset_times (np.array): Ring buffer of recent onset timestamps.
+        frames (int): Number of frames seen.
+        onsets (int): Number of onsets detected.
+        last_onset (float): Timestamp of the last onset.
+        flux (float): Spectral flux of the last frame.
+        threshold (float): Adaptive onset threshold for the last frame.
+        onset (bool): Whether an onset was detected in the last frame.
+        bpm (float): Running tempo estimate, 0 until enough onsets.
+        centroid (float): Spectral centroid of the last frame in Hz.
+        rms (float): RMS level of the last frame, 1.0 at full scale.
+    """
+
+    def __init__(self, rate, window, bins=None, flux_history=43,
+                 onset_history=16, threshold_factor=1.5,
+                 min_onset_interval=0.1, freqs=None, power_weights=None):
+        """
+        Initializes the feature state.
+
+        Args:
+            rate (int): Sampling rate of the audio in Hz.
+            window (np.array): Window function applied before the FFT.
+            bins (array, optional): Indexes of the analyzed FFT bins;
+            defaults to all of them.
+            flux_history (int): Number of frames the onset threshold
+            adapts over.
+            onset_history (int): Number of onsets the tempo is
+            estimated from.
+            threshold_factor (float): Standard deviations above the mean
+            flux an onset must reach.
+            min_onset_interval (float): Seconds to ignore after an onset.
+            freqs (array, optional): Center frequency of each analyzed value
+            in Hz, when the values are bands rather than FFT bins.
+            power_weights (array, optional): Times the power of each band
+            counts in the total; required with freqs.
+        """
+        chunk = len(window)
+        if freqs is None:
+            bins = (xp.arange(chunk // 2 + 1) if bins is None
+                    else xp.asarray(bins))
+            freqs = xp.fft.rfftfreq(chunk, 1 / rate)[bins]
+            power_weights = xp.where(
+                (bins == 0) | (bins == chunk // 2), 1.0, 2.0)
+        self.freqs = xp.asarray(freqs)
+        self.power_weights = xp.asarray(power_weights)
+        # Parseval's theorem for a real FFT, scaled to a full-scale int16
+        self.power_scale = 1 / (
+            chunk ** 2 * float(xp.mean(window ** 2)) * 32768 ** 2)
+        self.threshold_factor = threshold_factor
+        self.min_onset_interval = min_onset_interval
+        self.previous = xp.zeros(len(self.freqs))
+        self.flux_history = np.zeros(flux_history)
+        self.onset_times = np.zeros(onset_history)
+        self.frames = 0
+        self.onsets = 0
+        self.last_onset = -np.inf
+        self.flux = 0.0
+        self.threshold = 0.0
+        self.onset = False
+        self.bpm = 0.0
+        self.centroid = 0.0
+        self.rms = 0.0
+
+    def update(self, spectrum, timestamp=None):
+        """
+        Updates the features with the spectrum of a new frame.
+
+        Args:
+            spectrum (array): Magnitudes of the analyzed bins of the frame.
+            timestamp (float, optional): Capture time of the frame in
+            seconds; defaults to time.monotonic().
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        total_power = float(xp.sum(self.power_weights * spectrum ** 2))
+        self.rms = (total_power * self.power_scale) ** 0.5
+
+        total = float(xp.sum(spectrum))
+        self.centroid = (float(xp.sum(self.freqs * spectrum)) / total
+                         if total > 0 else 0.0)
+
+        compressed = xp.log1p(spectrum)
+        self.flux = float(
+            xp.sum(xp.maximum(compressed - self.previous, 0))) / len(spectrum)
+        self.previous = compressed
+
+        # Adapt the threshold to the recent flux before adding this frame
+        history = self.flux_history[:min(self.frames, len(self.flux_history))]
+        if len(history):
+            self.threshold = (history.mean()
+                              + self.threshold_factor * history.std())
+        self.flux_history[self.frames % len(self.flux_history)] = self.flux
+        self.frames += 1
+
+        self.onset = (len(history) == len(self.flux_history)
+                      and self.flux > self.threshold
+                      and timestamp - self.last_onset
+                      >= self.min_onset_interval)
+        if self.onset:
+            self.last_onset = timestamp
+            self.onset_times[self.onsets % len(self.onset_times)] = timestamp
+            self.onsets += 1
+            self.update_bpm()
+
+    def update_bpm(self):
+        """Re-estimates the tempo from the recent onset intervals."""
+        count = min(self.onsets, len(self.onset_times))
+        if count < 4:
+            return
+        intervals = np.diff(np.sort(self.onset_times[:count]))
+        intervals = intervals[intervals > 0]
+        if not len(intervals):
+            return
+        bpm = 60 / intervals
+        # Fold every interval into one octave so half and double time agree
+        bpm = bpm * 2.0 ** np.floor(np.log2(180 / bpm))
+        estimate = float(np.median(bpm))
+        self.bpm = (estimate if self.bpm == 0
+                    else 0.8 * self.bpm + 0.2 * estimate)
@@ -1,14 +1,19 @@
+import logging
 import os
 import time
+import numpy as np
 from .gpu_config import computation_lib as xp
+from .spectrum_analyzer import SpectrumAnalyzer, decode_samples
 
 
-def setup_environment(theme):
+def setup_environment(theme, features=None):
     """
     Configures the terminal environment based on the provided theme settings.
 
     Args:
         theme (dict): Contains settings for background and bar colors.
+        features (AudioFeatures, optional): Features of the current frame;
+        bars use the theme's beat color on frames with an onset.
     """
     if theme:
         if 'background_color' in theme and (
@@ -19,15 +24,82 @@ def setup_environment(theme):
             print(f"\033[48;2;{bg_color[0]};{
                 bg_color[1]};{bg_color[2]}m", end='')
 
-        if 'bar_color' in theme and theme['bar_color'] != 'default':
-            bar_color = tuple(map(int, theme['bar_color'].split(';')))
+        bar_color_key = 'bar_color'
+        if features is not None and features.onset and (
+                'beat_color' in theme and theme['beat_color'] != 'default'):
+            bar_color_key = 'beat_color'
+
+        if bar_color_key in theme and theme[bar_color_key] != 'default':
+            bar_color = tuple(map(int, theme[bar_color_key].split(';')))
             # set bar color
             print(f"\033[38;2;{
                 bar_color[0]};{bar_color[1]};{bar_color[2]}m", end='')
 
 
+def compute_spectrum(data, window):
+    """
+    Computes the magnitude spectrum of a buffer of audio.
+
+    Args:
+        data (bytes or np.ndarray): Audio as taken by decode_samples.
+        window (np.array): Window function to apply the audio data.
+
+    Returns:
+        array: Magnitudes of the `len(window) // 2 + 1` FFT bins.
+    """
+    data = decode_samples(data)
+
+    # Apply window function if needed
+    windowed_data = data * window
+    return xp.abs(xp.fft.rfft(windowed_data))
+
+
+def log_band_edges(n_bins, bands, low=1):
+    """
+    Computes logarithmically spaced band edges over the FFT bins.
+    Every band covers at least one bin.
+
+    Args:
+        n_bins (int): Number of FFT bins.
+        bands (int): Number of bands.
+        low (int, optional): First bin to include; bin 0 is the DC offset.
+
+    Returns:
+        array: The `bands + 1` increasing bin indexes bounding the bands.
+
+    Raises:
+        ValueError: if there are fewer bins than bands.
+    """
+    if bands > n_bins - low:
+        raise ValueError(
+            f"Cannot split {n_bins - low} bins into {bands} bands")
+    steps = np.arange(bands + 1)
+    edges = np.geomspace(low, n_bins, bands + 1).astype(np.int64)
+    # Push edges up so each band is at least one bin wide
+    edges = np.maximum.accumulate(edges - steps) + steps
+    edges = np.minimum(edges, n_bins - bands + steps)
+    return xp.asarray(edges)
+
+
+def reduce_bands(spectrum, edges):
+    """
+    Averages the FFT bins falling into each band.
+
+    Args:
+        spectrum (array): Magnitudes of the FFT bins.
+        edges (array): Band edges from log_band_edges.
+
+    Returns:
+        array: The mean magnitude of each band.
+    """
+    sums = xp.concatenate((xp.zeros(1), xp.cumsum(spectrum)))
+    return (sums[edges[1:]] - sums[edges[:-1]]) / (edges[1:] - edges[:-1])
+
+
 def process_audio_visualization(stream, chunk, rate, alpha, window, stop_event,
-                                draw_function, theme=None):
+                                draw_function, theme=None,
+                                wait_function=None, features=None,
+                                analyzer=None, frame_interval=0.1):
     """
     Processes and visualizes audio data in real-time using FFT
     and a specified drawing function.
@@ -42,40 +114,131 @@ def process_audio_visualization(stream, chunk, rate, alpha, window, stop_event,
         draw_function (function): A function that handles the drawing
         of audio data.
         theme (dict, optional): Theme settings for visual customization.
+        wait_function (function, optional): Called with the number of
+        seconds to wait between frames; defaults to time.sleep.
+        features (AudioFeatures, optional): Updated from the spectrum of
+        every frame.
+        analyzer (SpectrumAnalyzer, optional): Computes the bins or bands
+        to visualize; defaults to all of the FFT bins.
+        frame_interval (float): Seconds to wait after every frame.
     """
+    wait_function = wait_function or time.sleep
+    analyzer = analyzer or SpectrumAnalyzer(window)
+
     # Initialize smoothed FFT with zeros
-    smoothed_fft = xp.zeros(chunk // 2 + 1)
+    smoothed_fft = xp.zeros(len(analyzer))
 
     while not stop_event.is_set():
         data = stream.read_data()
         if data is None:
             continue
 
-        data = xp.frombuffer(data, dtype=xp.int16)
-        data = data.reshape(-1, 2).mean(axis=1)  # Average the two channels
-
-        # Apply window function if needed
-        windowed_data = data * window
-        fft_data = xp.abs(xp.fft.rfft(windowed_data))
+        fft_data = analyzer(data)
+        if features is not None:
+            features.update(fft_data)
 
         # Apply exponential moving average for smoothing
         smoothed_fft = alpha * smoothed_fft + (1 - alpha) * fft_data
 
-        cols, rows = os.get_terminal_size()
-        max_fft = xp.max(smoothed_fft, initial=1)  # Avoid division by zero
-        scaled_fft = xp.int16((smoothed_fft / max_fft) * rows)
+        render_frame(smoothed_fft, draw_function, theme, features)
+
+        wait_function(frame_interval)  # control frame rate
 
-        frame_buffer = [' ' * cols for _ in range(rows)]
 
+def render_frame(smoothed_fft, draw_function, theme=None, features=None):
+    """
+    Scales a smoothed spectrum to the terminal and draws it.
+
+    Args:
+        smoothed_fft (array): Smoothed magnitudes of the FFT bins.
+        draw_function (function): A function that handles the drawing
+        of audio data. If it returns a string, that string is written
+        instead of clearing the screen and writing the frame buffer.
+        theme (dict, optional): Theme settings for visual customization.
+        features (AudioFeatures, optional): Features of the current frame.
+    """
+    cols, rows = os.get_terminal_size()
+    max_fft = xp.max(smoothed_fft, initial=1)  # Avoid division by zero
+    scaled_fft = xp.int16((smoothed_fft / max_fft) * rows)
+
+    frame_buffer = [' ' * cols for _ in range(rows)]
+
+    # Drawing logic plug in; drawers that update the screen incrementally
+    # return their output instead of filling the frame buffer
+    output = draw_function(frame_buffer, cols, rows, scaled_fft)
+
+    if output is None:
         # Clear the terminal
         os.system('cls' if os.name == 'nt' else 'clear')
+        output = '\n'.join(frame_buffer)
+
+    # Setup theming
+    setup_environment(theme, features)
+
+    print(output, end='\033[0m', flush=True)
+
+
+def analyze_into_ring(stream, chunk, alpha, window, stop_event, ring,
+                      analyzer=None):
+    """
+    Analyzes audio as fast as it arrives and writes every smoothed
+    spectrum to a shared ring, for a renderer in another process.
+
+    Args:
+        stream (AudioCapture): The audio stream to analyze.
+        chunk (int): Number of audio samples per buffer.
+        alpha (float): Smoothing factor for the visualization.
+        window (np.array): Window function to apply the audio data.
+        stop_event (Event): Event to signal when the analysis should stop.
+        ring (SpectrumRing): Ring with one value per analyzed bin or band.
+        analyzer (SpectrumAnalyzer, optional): Computes the bins or bands
+        to visualize; defaults to all of the FFT bins.
+    """
+    analyzer = analyzer or SpectrumAnalyzer(window)
+    smoothed_fft = xp.zeros(len(analyzer))
 
-        # Setup theming
-        setup_environment(theme)
+    while not stop_event.is_set():
+        data = stream.read_data()
+        if data is None:
+            continue
+
+        fft_data = analyzer(data)
+        smoothed_fft = alpha * smoothed_fft + (1 - alpha) * fft_data
+        ring.write(smoothed_fft.get() if xp is not np else smoothed_fft)
 
-        # Drawing logic plug in
-        draw_function(frame_buffer, cols, rows, scaled_fft)
 
-        print('\n'.join(frame_buffer), end='\033[0m', flush=True)
+def process_ring_visualization(ring, stop_event, draw_function, theme=None,
+                               wait_function=None, frame_interval=0.1,
+                               producer=None):
+    """
+    Visualizes the newest spectrum in a shared ring on every frame,
+    skipping any frames the renderer had no time for. Stops when the
+    process writing the ring has exited.
 
-        time.sleep(0.1)  # control frame rate
+    Args:
+        ring (SpectrumRing): Ring written by analyze_into_ring.
+        stop_event (Event): Event to signal when the visualization should stop.
+        draw_function (function): A function that handles the drawing
+        of audio data.
+        theme (dict, optional): Theme settings for visual customization.
+        wait_function (function, optional): Called with the number of
+        seconds to wait between frames; defaults to time.sleep.
+        frame_interval (float): Seconds to wait after every frame.
+        producer (multiprocessing.Process, optional): The process writing
+        the ring.
+    """
+    wait_function = wait_function or time.sleep
+    spectrum = np.zeros(ring.frame_size, dtype=np.float32)
+    sequence = 0
+
+    while not stop_event.is_set():
+        if producer is not None and not producer.is_alive():
+            logging.error(f"Analysis process exited with code {
+                producer.exitcode}, stopping the visualization")
+            break
+        latest = ring.read_latest(spectrum, sequence)
+        if latest:
+            sequence = latest
+            render_frame(xp.asarray(spectrum), draw_function, theme)
+
+        wait_function(frame_interval)  # control frame rate
@@ -0,0 +1,220 @@
+import numpy as np
+from .gpu_config import computation_lib as xp
+from .audio_processing import log_band_edges
+from .spectrum_analyzer import decode_samples
+
+
+def half_band_filter(taps=23):
+    """
+    Designs a half-band low-pass filter for decimating by two.
+
+    Every other tap of a half-band filter is zero apart from the center
+    tap, which is 0.5, so only the even taps have to be stored and applied.
+
+    Args:
+        taps (int): Length of the filter; one less than a multiple of 4.
+
+    Returns:
+        np.array: The even taps, summing to 0.5 for unit gain at DC.
+
+    Raises:
+        ValueError: if taps is not one less than a multiple of 4.
+    """
+    if taps % 4 != 3:
+        raise ValueError(
+            f"Half-band filters need 4 * n + 3 taps, got {taps}")
+    n = np.arange(taps) - taps // 2
+    even = (np.sinc(n / 2) * np.hamming(taps))[::2]
+    return even * 0.5 / even.sum()
+
+
+class HalfBandDecimator:
+    """
+    A class to halve the sampling rate of a stream of samples.
+
+    The filter is split into its two polyphase components, which run at
+    the output rate: a short convolution of the even samples with the even
+    taps, and the odd samples scaled by the center tap. Samples still needed
+    by the next block are carried over, so a stream can be passed in blocks
+    of any length.
+
+    Attributes:
+        taps (array): Even taps of the half-band filter.
+        history (array): Input samples not consumed by the last block.
+    """
+
+    def __init__(self, taps):
+        """
+        Initializes the decimator with silence as the previous input.
+
+        Args:
+            taps (np.array): Even taps from half_band_filter.
+        """
+        self.taps = xp.asarray(taps)
+        self.history = xp.zeros(2 * len(taps) - 2)
+
+    def __call__(self, samples):
+        """
+        Filters and decimates a block of samples.
+
+        Args:
+            samples (array): The next samples of the stream.
+
+        Returns:
+            array: The next output samples, about half as many.
+        """
+        data = xp.concatenate((self.history, samples))
+        half = len(self.taps) - 1
+        count = (len(data) - 2 * half + 1) // 2
+        if count <= 0:
+            self.history = data
+            return xp.zeros(0)
+        even = data[:2 * (count + half):2]
+        center = data[half:half + 2 * count:2]
+        self.history = data[2 * count:]
+        return xp.convolve(even, self.taps, mode='valid') + 0.5 * center
+
+
+class MultiResolutionAnalyzer:
+    """
+    A class to compute log-spaced bands whose resolution improves towards
+    the bass, in the manner of a constant-Q transform.
+
+    The input is decimated by two once per octave, and each rate keeps its
+    latest `size` samples in one row of a shared ring buffer. A single
+    batched FFT over the rows then analyzes every octave with the same
+    number of bins: the treble from a few milliseconds at the full rate
+    and the bass from a window 2 ** (octaves - 1) times as long. This
+    costs a few small FFTs instead of one FFT long enough for the bass.
+
+    A row that receives more new samples than `size` per buffer analyzes
+    all of them in windows overlapping by half, and each band keeps its
+    loudest window, so a short transient anywhere in the buffer shows.
+
+    Below the top row, each row only covers the octave under a quarter of
+    its rate, well inside the passband of the decimator, so that no band
+    is attenuated or aliased by the filter. The top row covers the two
+    highest octaves.
+
+    Attributes:
+        rate (int): Sampling rate of the audio in Hz.
+        octaves (int): Number of rates analyzed.
+        size (int): FFT size of every row.
+        hop (int): Number of samples between the windows of one row.
+        decimators (list): Decimators producing rows 1 and up.
+        rings (array): Latest samples of each row; row k holds the input
+        at rate / 2 ** k.
+        window (array): Window function applied to every row.
+        band_rows (array): Row analyzing each band.
+        band_starts (array): First FFT bin of each band in its row.
+        band_ends (array): Bin after the last FFT bin of each band.
+        freqs (array): Center frequency of each band in Hz, ascending.
+        power_weights (array): Roughly how many times each band's power
+        counts in the total power.
+    """
+
+    def __init__(self, rate, octaves=8, size=256, bands_per_octave=12,
+                 taps=23):
+        """
+        Initializes the decimators, rings and bands.
+
+        Args:
+            rate (int): Sampling rate of the audio in Hz.
+            octaves (int): Number of rates analyzed; the lowest band
+            starts at rate / 2 ** (octaves + 2).
+            size (int): FFT size of every row; a multiple of 8.
+            bands_per_octave (int): Number of bands in each octave.
+            taps (int): Length of the half-band filters.
+
+        Raises:
+            ValueError: if octaves is less than 1 or an octave has fewer
+            bins than bands.
+        """
+        if octaves < 1:
+            raise ValueError(f"Need at least 1 octave, got {octaves}")
+        self.rate = rate
+        self.octaves = octaves
+        self.size = size
+        self.hop = size // 2
+        filter_taps = half_band_filter(taps)
+        self.decimators = [HalfBandDecimator(filter_taps)
+                           for _ in range(octaves - 1)]
+        self.rings = xp.zeros((octaves, size))
+        self.window = xp.hamming(size)
+
+        band_rows = []
+        band_starts = []
+        band_ends = []
+        freqs = []
+        for row in reversed(range(octaves)):
+            if row == 0:
+                edges = log_band_edges(
+                    size // 2 + 1, 2 * bands_per_octave, low=size // 8)
+            else:
+                edges = log_band_edges(
+                    size // 4, bands_per_octave, low=size // 8)
+            band_rows.append(xp.full(len(edges) - 1, row))
+            band_starts.append(edges[:-1])
+            band_ends.append(edges[1:])
+            bin_width = rate / 2 ** row / size
+            freqs.append((edges[:-1] + edges[1:] - 1) / 2 * bin_width)
+        self.band_rows = xp.concatenate(band_rows)
+        self.band_starts = xp.concatenate(band_starts)
+        self.band_ends = xp.concatenate(band_ends)
+        self.freqs = xp.concatenate(freqs)
+        # Real FFT bins but DC and Nyquist count twice
+        self.power_weights = 2 * (self.band_ends - self.band_starts)
+
+    def __len__(self):
+        """Returns the number of bands."""
+        return len(self.freqs)
+
+    def push(self, row, samples):
+        """
+        Appends samples to a row of the ring buffer, dropping the oldest.
+
+        Args:
+            row (int): Index of the row.
+            samples (array): Samples at the rate of the row.
+
+        Returns:
+            array: The windows of the row covering every new sample,
+            `hop` samples apart and the newest last.
+        """
+        history = xp.concatenate((self.rings[row], samples))
+        self.rings[row] = history[-self.size:]
+        count = max(-(-(len(samples) - self.size) // self.hop), 0) + 1
+        windows = xp.lib.stride_tricks.sliding_window_view(
+            history, self.size)
+        return windows[len(samples) - (count - 1) * self.hop::self.hop]
+
+    def __call__(self, data):
+        """
+        Computes the bands for a buffer of audio.
+
+        Args:
+            data (bytes or np.ndarray): Audio as taken by decode_samples.
+
+        Returns:
+            array: Mean magnitude of each band in its loudest window,
+            from the bass up.
+        """
+        samples = decode_samples(data)
+        windows = [self.push(0, samples)]
+        for row, decimate in enumerate(self.decimators, start=1):
+            samples = decimate(samples)
+            windows.append(self.push(row, samples))
+        window_rows = xp.concatenate(
+            [xp.full(len(row_windows), row)
+             for row, row_windows in enumerate(windows)])
+
+        spectra = xp.abs(
+            xp.fft.rfft(xp.concatenate(windows) * self.window, axis=1))
+        # Average the bins of every band at once, as in reduce_bands
+        sums = xp.cumsum(spectra, axis=1)
+        sums = xp.concatenate((xp.zeros((len(sums), 1)), sums), axis=1)
+        bands = ((sums[:, self.band_ends] - sums[:, self.band_starts])
+                 / (self.band_ends - self.band_starts))
+        # Keep each band's loudest window among those of its own row
+        bands = xp.where(window_rows[:, None] == self.band_rows, bands, 0)
+        return bands.max(axis=0)
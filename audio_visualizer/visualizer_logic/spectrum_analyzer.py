@@ -0,0 +1,187 @@
+import logging
+import time
+import numpy as np
+from .gpu_config import computation_lib as xp
+
+# Largest DFT matrix, in elements, worth timing against the FFT; about
+# twice the size at which the FFT was measured to win, e.g. 64 bins of
+# 2048 samples
+MAX_DFT_MATRIX_SIZE = 1 << 18
+
+
+def decode_samples(data):
+    """
+    Converts a buffer of audio to mono samples.
+
+    Args:
+        data (bytes or np.ndarray): Interleaved 16-bit stereo samples, or
+        samples at the 16-bit scale with one column per channel.
+
+    Returns:
+        array: The average of the channels.
+    """
+    if isinstance(data, np.ndarray):
+        return xp.asarray(data).mean(axis=1)
+    data = xp.frombuffer(data, dtype=xp.int16)
+    return data.reshape(-1, 2).mean(axis=1)  # Average the two channels
+
+
+def dft_matrix(window, bins):
+    """
+    Builds the matrix evaluating the windowed DFT at the given bins.
+
+    This computes the same values as a bank of Goertzel filters, with the
+    per-sample recurrence replaced by a single matrix product so that it
+    runs vectorized.
+
+    Args:
+        window (np.array): Window function to apply the audio data.
+        bins (array): Indexes of the FFT bins to evaluate.
+
+    Returns:
+        array: A `(2 * len(bins), len(window))` matrix; its product with
+        the samples holds the real parts followed by the imaginary parts.
+    """
+    n = xp.arange(len(window))
+    phase = 2 * xp.pi * xp.outer(xp.asarray(bins), n) / len(window)
+    return xp.concatenate((xp.cos(phase), -xp.sin(phase))) * window
+
+
+class SpectrumAnalyzer:
+    """
+    A class to compute the magnitudes of a subset of the FFT bins.
+
+    When only a few bins are needed, e.g. a narrow frequency range, a
+    direct DFT of just those bins is cheaper than a full FFT. Which of the
+    two is faster depends on the machine, so both are timed once and the
+    faster one is used. The cost depends on the number of bins, not on how
+    many bands they are later averaged into.
+
+    Attributes:
+        window (np.array): Window function to apply the audio data.
+        bins (array): Indexes of the FFT bins computed.
+        full (bool): Whether bins covers the whole spectrum in order.
+        matrix (array): DFT matrix for the bins, if strategy is 'dft'.
+        strategy (str): 'fft' or 'dft'.
+    """
+
+    def __init__(self, window, bins=None, strategy=None):
+        """
+        Initializes the analyzer and picks a strategy.
+
+        Args:
+            window (np.array): Window function to apply the audio data.
+            bins (array, optional): Indexes of the FFT bins to compute;
+            defaults to all of them.
+            strategy (str, optional): 'fft' or 'dft' to skip the timing.
+        """
+        n_bins = len(window) // 2 + 1
+        self.window = window
+        self.bins = xp.arange(n_bins) if bins is None else xp.asarray(bins)
+        self.full = len(self.bins) == n_bins and bool(
+            xp.all(self.bins == xp.arange(n_bins)))
+        self.matrix = None
+        self.strategy = strategy or self.choose_strategy()
+        if self.strategy == 'dft' and self.matrix is None:
+            self.matrix = dft_matrix(window, self.bins)
+
+    def __len__(self):
+        """Returns the number of bins."""
+        return len(self.bins)
+
+    def choose_strategy(self, repeats=20):
+        """
+        Times the FFT and the DFT of the bins on random audio.
+
+        Args:
+            repeats (int): Number of timed runs of each; the fastest counts.
+
+        Returns:
+            str: 'dft' if it was faster, 'fft' otherwise.
+        """
+        if self.full or (
+                2 * len(self.bins) * len(self.window) > MAX_DFT_MATRIX_SIZE):
+            return 'fft'
+
+        self.matrix = dft_matrix(self.window, self.bins)
+        samples = xp.asarray(
+            np.random.default_rng(0).uniform(-1, 1, len(self.window)))
+        timings = {}
+        for strategy, analyze in (('fft', self.analyze_fft),
+                                  ('dft', self.analyze_dft)):
+            best = float('inf')
+            for _ in range(repeats):
+                start = time.perf_counter()
+                analyze(samples)
+                best = min(best, time.perf_counter() - start)
+            timings[strategy] = best
+        strategy = min(timings, key=timings.get)
+        logging.info(
+            f"Using {strategy} for {len(self.bins)} bins: fft {
+                timings['fft'] * 1e6:.0f} us, dft {
+                timings['dft'] * 1e6:.0f} us")
+        if strategy == 'fft':
+            self.matrix = None
+        return strategy
+
+    def analyze_fft(self, samples):
+        """
+        Computes the bins with a full FFT.
+
+        Args:
+            samples (array): Mono samples, one per window value.
+
+        Returns:
+            array: Magnitudes of the bins.
+        """
+        spectrum = xp.abs(xp.fft.rfft(samples * self.window))
+        return spectrum if self.full else spectrum[self.bins]
+
+    def analyze_dft(self, samples):
+        """
+        Computes the bins with a direct DFT.
+
+        Args:
+            samples (array): Mono samples, one per window value.
+
+        Returns:
+            array: Magnitudes of the bins.
+        """
+        parts = self.matrix @ samples
+        return xp.hypot(parts[:len(self.bins)], parts[len(self.bins):])
+
+    def __call__(self, data):
+        """
+        Computes the magnitudes of the bins for a buffer of audio.
+
+        Args:
+            data (bytes or np.ndarray): Audio as taken by decode_samples.
+
+        Returns:
+            array: Magnitudes of the bins.
+        """
+        samples = decode_samples(data)
+        if self.strategy == 'dft':
+            return self.analyze_dft(samples)
+        return self.analyze_fft(samples)
+
+
+def frequency_bins(chunk, rate, min_freq=None, max_freq=None):
+    """
+    Returns the FFT bins covering a frequency range.
+
+    Args:
+        chunk (int): Number of audio samples per buffer.
+        rate (int): Sampling rate of the audio in Hz.
+        min_freq (float, optional): Lowest frequency in Hz; defaults to 0.
+        max_freq (float, optional): Highest frequency in Hz; defaults to
+        half the sampling rate.
+
+    Returns:
+        np.array: Indexes of the bins from min_freq to max_freq.
+    """
+    last = chunk // 2
+    low = 0 if min_freq is None else min(int(min_freq * chunk / rate), last)
+    high = last if max_freq is None else min(
+        int(np.ceil(max_freq * chunk / rate)), last)
+    return np.arange(low, max(high, low) + 1)
@@ -0,0 +1,125 @@
+from multiprocessing import shared_memory
+import numpy as np
+
+# The header holds the sequence number of the latest complete frame
+HEADER_SIZE = 8
+
+
+class SpectrumRing:
+    """
+    A class to pass fixed-size float32 spectra between processes through
+    shared memory, without pickling.
+
+    One process writes and another reads. Every slot carries the sequence
+    number of the frame in it; the writer clears it while the slot is being
+    overwritten, so a reader can detect a frame that changed under it and
+    retry. The reader only ever wants the newest frame, so a slow reader
+    skips frames instead of holding up the writer.
+
+    Attributes:
+        shm (SharedMemory): Shared memory block backing the ring.
+        frame_size (int): Number of float32 values per frame.
+        slots (int): Number of frames the ring holds.
+        latest (np.array): One int64 with the latest sequence number.
+        sequences (np.array): Sequence number of the frame in each slot.
+        frames (np.array): The frames, one row per slot.
+    """
+
+    def __init__(self, shm, frame_size, slots):
+        """
+        Maps the ring onto a shared memory block. Use create or attach.
+
+        Args:
+            shm (SharedMemory): Shared memory block backing the ring.
+            frame_size (int): Number of float32 values per frame.
+            slots (int): Number of frames the ring holds.
+        """
+        self.shm = shm
+        self.frame_size = frame_size
+        self.slots = slots
+        self.latest = np.ndarray((1,), dtype=np.int64, buffer=shm.buf)
+        self.sequences = np.ndarray((slots,), dtype=np.int64, buffer=shm.buf,
+                                    offset=HEADER_SIZE)
+        self.frames = np.ndarray((slots, frame_size), dtype=np.float32,
+                                 buffer=shm.buf,
+                                 offset=HEADER_SIZE + 8 * slots)
+
+    @classmethod
+    def create(cls, frame_size, slots=4):
+        """
+        Creates a new, empty ring.
+
+        Args:
+            frame_size (int): Number of float32 values per frame.
+            slots (int): Number of frames the ring holds.
+
+        Returns:
+            SpectrumRing: The ring; its `shm.name` is used to attach to it.
+        """
+        size = HEADER_SIZE + 8 * slots + 4 * frame_size * slots
+        ring = cls(shared_memory.SharedMemory(create=True, size=size),
+                   frame_size, slots)
+        ring.latest[0] = 0
+        ring.sequences[:] = 0
+        return ring
+
+    @classmethod
+    def attach(cls, name, frame_size, slots=4):
+        """
+        Attaches to a ring created by another process.
+
+        Args:
+            name (str): Name of the shared memory block.
+            frame_size (int): Number of float32 values per frame.
+            slots (int): Number of frames the ring holds.
+
+        Returns:
+            SpectrumRing: The ring.
+        """
+        return cls(shared_memory.SharedMemory(name=name), frame_size, slots)
+
+    def write(self, frame):
+        """
+        Writes a frame to the next slot.
+
+        Args:
+            frame (array): The frame_size values to write.
+        """
+        sequence = int(self.latest[0]) + 1
+        slot = sequence % self.slots
+        self.sequences[slot] = 0  # Mark the slot as being written
+        self.frames[slot] = frame
+        self.sequences[slot] = sequence
+        self.latest[0] = sequence
+
+    def read_latest(self, out, last_sequence=0):
+        """
+        Copies the newest frame if it is newer than the last one read.
+
+        Args:
+            out (np.array): Array of frame_size float32 values to copy into.
+            last_sequence (int): Sequence number of the last frame read.
+
+        Returns:
+            int: Sequence number of the frame copied into out,
+            or 0 if there is no newer frame.
+        """
+        while True:
+            sequence = int(self.latest[0])
+            if sequence <= last_sequence:
+                return 0
+            slot = sequence % self.slots
+            out[:] = self.frames[slot]
+            if self.sequences[slot] == sequence:
+                return sequence
+            # The writer lapped the reader mid-copy, try the newer frame
+
+    def close(self):
+        """Unmaps the ring from this process."""
+        # Views into the buffer must be released before it can be closed
+        del self.latest, self.sequences, self.frames
+        self.shm.close()
+
+    def unlink(self):
+        """Frees the shared memory block; call once, from the creator."""
+        self.shm.unlink()
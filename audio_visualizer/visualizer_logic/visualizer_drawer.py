@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def draw_vertical(frame_buffer, cols, rows, scaled_fft):
     """
     Draws the audio data in a vertical visualization format.
@@ -46,3 +49,79 @@ def draw_horizontal_rtl(frame_buffer, cols, rows, scaled_fft):
     for row in range(min(rows, len(scaled_fft))):
         bar_width = scaled_fft[row]
         frame_buffer[row] = ' ' * (cols - bar_width) + '█' * bar_width
+
+
+class WaterfallDrawer:
+    """
+    Draws the audio data as a scrolling spectrogram, one row per frame,
+    with the newest row at the bottom.
+
+    Only the new row is written each frame: the terminal's scroll region
+    is set to the whole screen and the terminal scrolls the older rows
+    up itself. The history is kept in a fixed-size circular buffer so the
+    screen can be redrawn when the terminal is resized.
+
+    Attributes:
+        SHADES (str): Characters for increasing intensity.
+        history (np.array): Circular buffer of shade indexes, one row
+        per frame.
+        head (int): Index of the row the next frame is written to.
+    """
+
+    SHADES = ' ░▒▓█'
+
+    def __init__(self):
+        self.history = None
+        self.head = 0
+
+    def row(self, index):
+        """
+        Renders one row of the history.
+
+        Args:
+            index (int): Index of the row in the circular buffer.
+
+        Returns:
+            str: The row as shade characters.
+        """
+        return ''.join(self.SHADES[level] for level in self.history[index])
+
+    def __call__(self, frame_buffer, cols, rows, scaled_fft):
+        """
+        Adds the audio data as the newest row of the waterfall.
+
+        Args:
+            frame_buffer (list): The buffer where the frame data is stored;
+            unused, as only the new row is written.
+            cols (int): The number of columns in the terminal.
+            rows (int): The number of rows in the terminal.
+            scaled_fft (array): The scaled FFT data used to determine the
+            intensity of each column.
+
+        Returns:
+            str: Terminal output drawing the frame, written in place of
+            the frame buffer.
+        """
+        full_redraw = self.history is None or self.history.shape != (
+            rows, cols)
+        if full_redraw:
+            self.history = np.zeros((rows, cols), dtype=np.uint8)
+            self.head = 0
+
+        count = min(cols, len(scaled_fft))
+        values = scaled_fft[:count]
+        if not isinstance(values, np.ndarray):
+            values = values.get()  # CuPy arrays are copied back from the GPU
+        levels = self.history[self.head]
+        levels[:] = 0
+        levels[:count] = np.minimum(
+            values * (len(self.SHADES) - 1) // rows, len(self.SHADES) - 1)
+        newest = self.head
+        self.head = (self.head + 1) % rows
+
+        if full_redraw:
+            # Limit scrolling to the screen and draw the history, oldest first
+            return f"\033[2J\033[1;{rows}r\033[H" + '\n'.join(
+                self.row((self.head + i) % rows) for i in range(rows))
+        # Scroll the screen up one line and draw the new row at the bottom
+        return f"\033[{rows};1H\n" + self.row(newest)
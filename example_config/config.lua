@@ -1,10 +1,9 @@
 return {
     key_binds = {
         -- The modifier key used for hotkeys. Possible values are 'ctrl', 'shift', 'alt'.
-        -- Note: On macOS, using 'shift or 'alt' can alter the character keys.
-        -- For example, 'shift' + 'l' becomes 'L', and 'alt' + 'l' might result in a non-alphanumeric character '¬'.
+        -- Hotkeys are read from the terminal, so 'shift' + 'l' is received as 'L' and 'alt' + 'l' as escape followed by 'l'.
+        -- Note: On macOS, 'alt' only works if the terminal is set to use Option as Meta key.
         -- 'alt' works best on windows.
-        -- Users should adjust the 'keys' bindings accordingly if using 'shift' or 'alt'.
         modifier_key = 'ctrl',
 
         -- Defines the hotkeys for switching visualization modes.
@@ -12,7 +11,8 @@ return {
         keys = {  -- Hotkeys for mode-switcher (all are inherently prefaced with the 'ctrl' modifier key)
             j = 'vertical',  -- Hotkey for vertical visualization mode.
             h = 'horizontal-ltr',  -- Hotkey for horizonta left-to-right mode.
-            l = 'horizontal-rtl'  -- Hotkey for horizontal right-to-left mode.
+            l = 'horizontal-rtl',  -- Hotkey for horizontal right-to-left mode.
+            k = 'waterfall'  -- Hotkey for the scrolling spectrogram mode.
         },
     },
     settings = {
@@ -20,13 +20,14 @@ return {
         alpha = 0.4,  -- Smoothing factor for the Fast Fourier Transform (FFT).
         chunk_size = 2048,  -- Number of audio samples per buffer.
         sample_rate = 44100  -- Audio sampling rate in Hertz (samples per second).
-        audio_source = 'Audio Device Name',  -- Customize this with any Audio Device name. This can be deleted if you want the program to choose
+        audio_source = 'Audio Device Name',  -- Customize this with any Audio Device name. Part of a name also matches, and 're:' followed by a pattern matches by regular expression. '-' reads raw PCM audio from stdin and 'fifo:' followed by a path reads it from a named pipe. This can be deleted if you want the program to choose
     },
     themes = {
         -- Theme settings for the visualization background and bar colors.
         -- Specify colors in 'RGB' format separated by semicolons (e.g., '255;0;0' for red).
         -- Use 'default' to utilize the terminal's default color settings.
         background_color = 'default',  -- Background color of the visualization.
-        bar_color = 'default'  -- Color of the visualization bars.
+        bar_color = 'default',  -- Color of the visualization bars.
+        beat_color = 'default'  -- Color of the bars on frames where a beat is detected.
     }
 }
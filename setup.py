@@ -19,23 +19,15 @@ setup(
         "lupa==2.2",
         "mccabe==0.7.0",
         "numpy==1.26.4",
-        "PyAudio==0.2.14",  # Handles audio operations
         "pycodestyle==2.11.1",
         "pyflakes==3.2.0",
-        "pynput==1.7.6",  # Monitor and control user input devices
         "six==1.16.0"  # Python 2 and 3 compatibility utilities
     ],
     extras_require={
-        # Additional dependencies for macOS platform
-        ':sys_platform=="darwin"': [
-            "pyobjc-core==10.3.1",  # Objective-C bridge
-            "pyobjc-framework-ApplicationServices==10.3.1",
-            "pyobjc-framework-Cocoa==10.3.1",
-            "pyobjc-framework-CoreText==10.3.1",
-            "pyobjc-framework-Quartz==10.3.1",
-        ],
         # Dependencies only for CUDA or ROCm enabled GPU's
-        'gpu': ['cupy==13.2.0']
+        'gpu': ['cupy==13.2.0'],
+        # Dependencies only for capturing from an audio device
+        'device': ['PyAudio==0.2.14']
     },
     # Defines the entry point for the console script.
     entry_points={
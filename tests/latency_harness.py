@@ -0,0 +1,291 @@
+"""
+latency_harness.py
+
+Measures how late the bars are compared with the sound. A synthetic source
+injects timestamped impulses or tone bursts through the AudioCapture
+interface in real time, and a capturing fake terminal timestamps the first
+frame in which each one shows up.
+
+Run `python -m tests.latency_harness` for a report over modes, chunk
+sizes, hops and frame rates.
+"""
+
+import io
+import itertools
+import os
+import time
+from threading import Event
+from unittest.mock import patch
+import numpy as np
+
+from audio_visualizer.visualizer import get_visualization_function
+from audio_visualizer.visualizer_logic.audio_processing import (
+    process_audio_visualization
+)
+from audio_visualizer.visualizer_logic.visualizer_drawer import (
+    WaterfallDrawer
+)
+
+STAGES = ('capture', 'analysis', 'written')
+# Characters drawn for a non-zero bar or waterfall cell
+BAR_CHARACTERS = set('█' + WaterfallDrawer.SHADES[1:])
+
+
+class SyntheticSource:
+    """
+    A class standing in for AudioCapture that plays a schedule of impulses
+    or tone bursts in real time.
+
+    Reads return windows of `chunk` samples advancing by `hop` samples, and
+    block until the last sample of the window has been "captured". Like a
+    real input buffer, audio not read within `buffer_chunks` windows is
+    dropped, so a reader slower than real time sees the buffered delay.
+
+    Attributes:
+        CHUNK (int): Number of audio samples per buffer.
+        RATE (int): Sample rate (samples per second).
+        hop (int): Number of samples between the starts of two windows.
+        events (list): Sample index of each impulse or burst.
+        signal (np.array): Samples of one impulse or burst.
+        buffer_samples (int): Number of samples the input buffer holds.
+        stop_event (Event): Set once every event has been played.
+        start (float): Time at which sample 0 was captured.
+        position (int): Index of the first sample of the next window.
+        last_read (tuple): Window start, window end and return time of
+        the latest read.
+        reads (int): Number of windows returned.
+        dropped (int): Number of windows dropped by the input buffer.
+    """
+
+    def __init__(self, chunk, rate, hop, signal='impulse', count=5,
+                 spacing=0.25, buffer_chunks=4, stop_event=None):
+        """
+        Initializes the schedule of events.
+
+        Args:
+            chunk (int): Number of audio samples per buffer.
+            rate (int): Sampling rate in Hz.
+            hop (int): Number of samples between window starts.
+            signal (str): 'impulse' or 'tone' (a 5 ms burst at 1 kHz).
+            count (int): Number of events to play.
+            spacing (float): Seconds between events.
+            buffer_chunks (int): Size of the input buffer in windows.
+            stop_event (Event, optional): Set once every event was played.
+        """
+        self.CHUNK = chunk
+        self.RATE = rate
+        self.hop = hop
+        # Offset events so they do not line up with window boundaries
+        self.events = [int((0.1 + i * spacing) * rate) + 7 * i
+                       for i in range(count)]
+        if signal == 'impulse':
+            self.signal = np.array([30000.0])
+        elif signal == 'tone':
+            t = np.arange(int(0.005 * rate)) / rate
+            self.signal = np.sin(2 * np.pi * 1000 * t) * 30000
+        else:
+            raise ValueError(f"Unsupported signal: {signal}")
+        self.buffer_samples = buffer_chunks * chunk
+        self.stop_event = stop_event or Event()
+        self.start = None
+        self.position = 0
+        self.last_read = None
+        self.reads = 0
+        self.dropped = 0
+
+    def event_time(self, index):
+        """
+        Returns the time at which the first sample of an event was captured.
+
+        Args:
+            index (int): Index of the event.
+
+        Returns:
+            float: The time on the time.monotonic() clock.
+        """
+        return self.start + self.events[index] / self.RATE
+
+    def read_data(self):
+        """
+        Reads the next window, blocking until it has been captured.
+
+        Returns:
+            bytes: Interleaved 16-bit stereo samples.
+        """
+        now = time.monotonic()
+        if self.start is None:
+            self.start = now
+        captured = int((now - self.start) * self.RATE)
+        # Drop whole windows that fell out of the input buffer
+        overflow = captured - self.buffer_samples - self.position
+        if overflow > 0:
+            skipped = -(-overflow // self.hop)
+            self.position += skipped * self.hop
+            self.dropped += skipped
+
+        end = self.position + self.CHUNK
+        delay = self.start + end / self.RATE - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+        samples = np.zeros(self.CHUNK)
+        for event in self.events:
+            first = max(event, self.position)
+            last = min(event + len(self.signal), end)
+            if first < last:
+                samples[first - self.position:last - self.position] = \
+                    self.signal[first - event:last - event]
+        samples = samples.astype(np.int16)
+
+        self.last_read = (self.position, end, time.monotonic())
+        self.position += self.hop
+        self.reads += 1
+        if self.position > self.events[-1] + len(self.signal):
+            self.stop_event.set()
+        return np.vstack((samples, samples)).T.tobytes()
+
+
+class CapturingTerminal(io.StringIO):
+    """
+    A class standing in for stdout that timestamps every write.
+
+    Attributes:
+        writes (list): Time and text of each write.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write(self, text):
+        """
+        Records a write.
+
+        Args:
+            text (str): The text written.
+
+        Returns:
+            int: The number of characters written.
+        """
+        self.writes.append((time.monotonic(), text))
+        return len(text)
+
+
+def measure_latency(mode='vertical', chunk=2048, hop=None, fps=10,
+                    rate=44100, signal='impulse', count=5, spacing=0.25,
+                    alpha=0.0, buffer_chunks=4, size=(80, 24)):
+    """
+    Plays events through the visualization and measures when each one
+    shows up on the fake terminal.
+
+    Args:
+        mode (str): The visualization mode.
+        chunk (int): Number of audio samples per buffer.
+        hop (int, optional): Number of samples between window starts;
+        defaults to chunk.
+        fps (float): Frame rate the render loop is paced to; sets the
+        loop's frame interval, which it waits for in real time.
+        rate (int): Sampling rate in Hz.
+        signal (str): 'impulse' or 'tone'.
+        count (int): Number of events to play.
+        spacing (float): Seconds between events.
+        alpha (float): Smoothing factor; 0 clears the bars between events
+        so that every event appears on an empty frame.
+        buffer_chunks (int): Size of the input buffer in windows.
+        size (tuple): Columns and rows of the fake terminal.
+
+    Returns:
+        dict: Seconds from the sound to each stage, keyed by stage, with
+        one value per event seen, the number of events 'missed' and the
+        frame rate achieved as 'fps'.
+    """
+    stop_event = Event()
+    source = SyntheticSource(chunk, rate, hop or chunk, signal=signal,
+                             count=count, spacing=spacing,
+                             buffer_chunks=buffer_chunks,
+                             stop_event=stop_event)
+    terminal = CapturingTerminal()
+    draw = get_visualization_function(mode)
+    seen = {}
+
+    def draw_function(frame_buffer, cols, rows, scaled_fft):
+        analyzed = time.monotonic()
+        output = draw(frame_buffer, cols, rows, scaled_fft)
+        first, end, captured = source.last_read
+        for index, event in enumerate(source.events):
+            if first <= event < end and index not in seen:
+                seen[index] = (captured, analyzed, len(terminal.writes))
+        return output
+
+    with patch('sys.stdout', new=terminal), \
+            patch('os.system'), \
+            patch('os.get_terminal_size',
+                  return_value=os.terminal_size(size)):
+        process_audio_visualization(
+            stream=source,
+            chunk=chunk,
+            rate=rate,
+            alpha=alpha,
+            window=np.hamming(chunk),
+            stop_event=stop_event,
+            draw_function=draw_function,
+            frame_interval=1 / fps)
+
+    latencies = {stage: [] for stage in STAGES}
+    for index, (captured, analyzed, first_write) in sorted(seen.items()):
+        # The event shows up in the first write of its frame with a bar
+        written = next((written for written, text
+                        in terminal.writes[first_write:]
+                        if not BAR_CHARACTERS.isdisjoint(text)),
+                       None)
+        if written is None:
+            continue
+        sound = source.event_time(index)
+        for stage, stamp in zip(STAGES, (captured, analyzed, written)):
+            latencies[stage].append(stamp - sound)
+    latencies['missed'] = count - len(latencies['written'])
+    latencies['fps'] = source.reads / (time.monotonic() - source.start)
+    return latencies
+
+
+def summarize(latencies):
+    """
+    Computes the p50 and p99 of each stage in milliseconds.
+
+    Args:
+        latencies (dict): Result of measure_latency.
+
+    Returns:
+        dict: Maps each stage to a (p50, p99) tuple, or None if no
+        event was seen.
+    """
+    summary = {}
+    for stage in STAGES:
+        values = np.array(latencies[stage]) * 1000
+        summary[stage] = (tuple(np.percentile(values, [50, 99]))
+                          if len(values) else None)
+    return summary
+
+
+def main():
+    """Prints a latency report over modes, chunks, hops and frame rates."""
+    print(f"{'mode':<16}{'chunk':>6}{'hop':>6}{'fps':>5}"
+          + ''.join(f"{stage + ' p50/p99 ms':>24}" for stage in STAGES)
+          + f"{'missed':>8}")
+    modes = ('vertical', 'horizontal-ltr', 'horizontal-rtl', 'waterfall')
+    for mode, chunk, fps in itertools.product(
+            modes, (1024, 2048, 4096), (10, 30, 60)):
+        for hop in (chunk, chunk // 2):
+            latencies = measure_latency(mode=mode, chunk=chunk, hop=hop,
+                                        fps=fps)
+            summary = summarize(latencies)
+            print(f"{mode:<16}{chunk:>6}{hop:>6}{fps:>5}"
+                  + ''.join(f"{'-':>24}" if summary[stage] is None else
+                            f"{summary[stage][0]:>15.1f}/"
+                            f"{summary[stage][1]:<8.1f}"
+                            for stage in STAGES)
+                  + f"{latencies['missed']:>8}")
+
+
+if __name__ == '__main__':
+    main()
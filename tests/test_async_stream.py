@@ -0,0 +1,123 @@
+"""
+test_async_stream.py
+
+Unit tests for async_stream.py module.
+"""
+
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+
+from audio_visualizer.async_stream import SpectrumStream, spectrum_stream
+from audio_visualizer.visualizer_logic.audio_processing import (
+    log_band_edges
+)
+
+
+class TestSpectrumStream(unittest.TestCase):
+    """
+    Test cases for streaming band spectra to asyncio consumers.
+    """
+
+    def setUp(self):
+        self.chunk = 2048
+        self.rate = 44100
+
+        # Simulate some audio data (sine wave)
+        t = np.arange(self.chunk) / self.rate
+        sine_wave = (np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+        audio_data = np.vstack((sine_wave, sine_wave)).T.tobytes()
+        self.source = MagicMock()
+        self.source.CHUNK = self.chunk
+        self.source.RATE = self.rate
+        self.source.read_data.return_value = audio_data
+
+    async def collect(self, stream, count):
+        """Collects the given number of frames from an async iterator."""
+        frames = []
+        async for frame in stream:
+            frames.append(frame)
+            if len(frames) == count:
+                break
+        return frames
+
+    def test_log_band_edges(self):
+        """Test that every band covers at least one FFT bin."""
+        edges = log_band_edges(self.chunk // 2 + 1, 64)
+        self.assertEqual(len(edges), 65)
+        self.assertTrue(np.all(np.diff(edges) >= 1))
+        self.assertEqual(edges[-1], self.chunk // 2 + 1)
+
+    def test_frames(self):
+        """Test that frames are read-only band arrays scaled to 0-1."""
+        frames = asyncio.run(self.collect(
+            spectrum_stream(self.source, bands=32, fps=1000), 3))
+        self.assertEqual(len(frames), 3)
+        frame = frames[0]
+        self.assertEqual(frame.shape, (32,))
+        self.assertFalse(frame.flags.writeable)
+        self.assertAlmostEqual(frame.max(), 1.0, places=5)
+        self.source.stop_stream.assert_not_called()
+
+    def test_shared_source(self):
+        """Test that several consumers receive frames from one source."""
+        stream = SpectrumStream(self.source, bands=16, fps=1000)
+
+        async def consume_both():
+            return await asyncio.gather(
+                self.collect(stream, 2), self.collect(stream, 2))
+
+        first, second = asyncio.run(consume_both())
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertTrue(stream.task.done())
+
+    def test_subscribe_while_stopping(self):
+        """Test that a consumer arriving during a stop restarts the reader."""
+        stream = SpectrumStream(self.source, bands=16, fps=1000)
+        stream.owns_source = True
+        stopping = threading.Event()
+        resume = threading.Event()
+
+        def stop_stream():
+            stopping.set()
+            resume.wait(5)
+        self.source.stop_stream.side_effect = stop_stream
+
+        async def consume_during_stop():
+            loop = asyncio.get_running_loop()
+            first = asyncio.create_task(self.collect(stream, 1))
+            await loop.run_in_executor(None, stopping.wait, 5)
+            second = asyncio.create_task(self.collect(stream, 2))
+            await asyncio.sleep(0)  # Let the second consumer subscribe
+            resume.set()
+            await first
+            return await second
+
+        frames = asyncio.run(consume_during_stop())
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(self.source.start_stream.call_count, 2)
+
+    def test_analyzed_bins(self):
+        """Test that only the bins within the frequency range are analyzed."""
+        stream = SpectrumStream(self.source, bands=16)
+        self.assertEqual(len(stream.analyzer), self.chunk // 2)
+        self.assertEqual(stream.analyzer.strategy, 'fft')
+
+        stream = SpectrumStream(self.source, bands=4, max_freq=250)
+        self.assertEqual(len(stream.analyzer), 12)
+        frames = asyncio.run(self.collect(stream, 1))
+        self.assertEqual(frames[0].shape, (4,))
+
+    def test_read_error(self):
+        """Test that an error in the reader reaches the consumer."""
+        self.source.read_data.side_effect = IOError("device lost")
+        with self.assertRaises(IOError):
+            asyncio.run(self.collect(
+                spectrum_stream(self.source, bands=16), 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ test_audio_capture.py
 Unit tests for audio_capture.py module.
 """
 
+import logging
 import unittest
 from unittest.mock import patch, MagicMock
 from audio_visualizer.audio_capture import AudioCapture
@@ -71,6 +72,68 @@ class TestAudioCapture(unittest.TestCase):
         self.assertIsNotNone(data)
         self.assertEqual(len(data), self.chunk * 2)
 
+    @patch('audio_visualizer.backoff.time.sleep')
+    def test_read_data_failure(self, mock_sleep):
+        """
+        Test that failed reads are counted instead of logged on every read
+        and that the stream is reopened with a growing delay.
+        """
+        self.mock_stream.read.side_effect = IOError("Input overflowed")
+
+        with self.assertLogs(level='DEBUG') as logs:
+            for _ in range(2):
+                self.assertIsNone(self.audio_capture.read_data())
+        self.assertFalse(any('Read failed' in line for line in logs.output))
+        self.assertEqual(
+            self.audio_capture.read_errors.counts['Read failed'], 2)
+        mock_sleep.assert_called_once_with(0.05)
+        self.assertEqual(self.audio_capture.backoff.delay, 0.1)
+
+    @patch('audio_visualizer.audio_capture.pyaudio.PyAudio')
+    @patch('audio_visualizer.backoff.time.sleep')
+    def test_recover_stream_failure(self, mock_sleep, MockPyAudio):
+        """
+        Test that failed reopens are counted and the devices are only
+        logged when they change.
+        """
+        audio = MockPyAudio.return_value
+        audio.open.side_effect = IOError("Device unavailable")
+        audio.get_device_count.return_value = 2
+        audio.get_device_info_by_index.side_effect = (
+            lambda i: {'name': f'Device {i}', 'index': i})
+        self.audio_capture.audio = audio
+        self.audio_capture.stream = None
+
+        with self.assertLogs(level='DEBUG') as logs:
+            for _ in range(5):
+                self.assertIsNone(self.audio_capture.read_data())
+            logging.debug("End of test")
+        self.assertFalse(any(
+            line.startswith('ERROR') for line in logs.output))
+        self.assertEqual(
+            sum('Device 0' in line for line in logs.output), 1)
+        self.assertEqual(self.audio_capture.read_errors.counts[
+            'Failed to open stream'], 5)
+        self.assertEqual(self.audio_capture.read_errors.counts[
+            'Device not found'], 5)
+
+    def test_find_device(self):
+        """
+        Test looking up devices by exact name, substring and pattern.
+        """
+        names = ['MacBook Pro Microphone', 'BlackHole 2ch', 'BlackHole 16ch']
+        self.audio_capture.audio.get_device_count.return_value = len(names)
+        self.audio_capture.audio.get_device_info_by_index.side_effect = [
+            {'name': name, 'index': i} for i, name in enumerate(names)]
+
+        self.assertEqual(self.audio_capture.find_device('BlackHole 16ch'), 2)
+        self.assertEqual(self.audio_capture.find_device('BlackHole'), 1)
+        self.assertEqual(self.audio_capture.find_device('re:16ch$'), 2)
+        self.assertIsNone(self.audio_capture.find_device('Speakers'))
+        # Devices are enumerated once
+        self.assertEqual(
+            self.audio_capture.audio.get_device_info_by_index.call_count, 3)
+
     def test_stop_stream(self):
         """
         Test stopping the audio stream.
@@ -0,0 +1,66 @@
+"""
+test_audio_features.py
+
+Unit tests for audio_features.py module.
+"""
+
+import unittest
+import numpy as np
+
+from audio_visualizer.visualizer_logic.audio_features import AudioFeatures
+from audio_visualizer.visualizer_logic.audio_processing import (
+    compute_spectrum
+)
+
+
+class TestAudioFeatures(unittest.TestCase):
+    """
+    Test cases for the per-frame audio features.
+    """
+
+    def setUp(self):
+        self.chunk = 2048
+        self.rate = 44100
+        self.window = np.hamming(self.chunk)
+        self.features = AudioFeatures(self.rate, self.window)
+
+    def spectrum(self, samples):
+        """Computes the spectrum of mono samples sent as stereo."""
+        samples = samples.astype(np.int16)
+        return compute_spectrum(
+            np.vstack((samples, samples)).T.tobytes(), self.window)
+
+    def test_level_and_centroid(self):
+        """Test the RMS and centroid of pure tones."""
+        t = np.arange(self.chunk) / self.rate
+        low_tone = np.sin(2 * np.pi * 500 * t) * 16384
+        self.features.update(self.spectrum(low_tone), timestamp=0)
+        self.assertAlmostEqual(self.features.rms, 0.5 / np.sqrt(2), places=2)
+        low_centroid = self.features.centroid
+
+        high_tone = np.sin(2 * np.pi * 4000 * t) * 16384
+        self.features.update(self.spectrum(high_tone), timestamp=1)
+        self.assertGreater(low_centroid, 500)
+        self.assertGreater(self.features.centroid, 4000)
+        self.assertLess(low_centroid, self.features.centroid)
+
+    def test_onsets_and_bpm(self):
+        """Test that clicks at 120 BPM are detected as onsets."""
+        rng = np.random.default_rng(0)
+        silence = np.zeros(self.chunk)
+        click = silence.copy()
+        click[:64] = rng.uniform(-30000, 30000, 64)
+        frame_time = 0.05
+        onsets = 0
+        for frame in range(200):
+            # A click every 10 frames is every 0.5 seconds
+            samples = click if frame % 10 == 0 else silence
+            self.features.update(
+                self.spectrum(samples), timestamp=frame * frame_time)
+            onsets += self.features.onset
+        self.assertGreaterEqual(onsets, 15)
+        self.assertAlmostEqual(self.features.bpm, 120, delta=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+test_backoff.py
+
+Unit tests for backoff.py module.
+"""
+
+import unittest
+from unittest.mock import call, patch
+
+from audio_visualizer.backoff import Backoff
+
+
+class TestBackoff(unittest.TestCase):
+    """
+    Test cases for spacing out retries.
+    """
+
+    @patch('audio_visualizer.backoff.time.sleep')
+    def test_doubling(self, mock_sleep):
+        """Test that waits double up to the limit and reset."""
+        backoff = Backoff(min_delay=0.25, max_delay=1.0)
+        self.assertFalse(backoff.retrying)
+        for _ in range(4):
+            backoff.wait()
+        self.assertTrue(backoff.retrying)
+        mock_sleep.assert_has_calls(
+            [call(0.25), call(0.5), call(1.0), call(1.0)])
+
+        backoff.reset()
+        self.assertFalse(backoff.retrying)
+        self.assertEqual(backoff.delay, 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+test_hotkeys.py
+
+Unit tests for hotkeys.py module.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from audio_visualizer.hotkeys import (
+    TerminalHotkeys, build_key_table, split_key_sequences
+)
+
+
+class TestHotkeys(unittest.TestCase):
+    """
+    Test cases for resolving and dispatching terminal hotkeys.
+    """
+
+    def setUp(self):
+        self.key_binds = {
+            'modifier_key': 'ctrl',
+            'keys': {
+                'j': 'vertical',
+                'h': 'horizontal-ltr',
+                'l': 'horizontal-rtl'
+            }
+        }
+
+    def test_build_key_table_ctrl(self):
+        """Test that ctrl bindings resolve to control characters."""
+        table = build_key_table(self.key_binds)
+        self.assertEqual(table, {
+            '\n': 'vertical',
+            '\x08': 'horizontal-ltr',
+            '\x0c': 'horizontal-rtl'
+        })
+
+    @patch('audio_visualizer.hotkeys.os.name', 'posix')
+    def test_build_key_table_alt(self):
+        """Test that alt bindings resolve to escape-prefixed keys."""
+        self.key_binds['modifier_key'] = 'alt'
+        table = build_key_table(self.key_binds)
+        self.assertEqual(table['\x1bj'], 'vertical')
+
+    def test_split_key_sequences(self):
+        """Test that escape sequences are not split into plain keys."""
+        self.assertEqual(
+            split_key_sequences('a\x1b[1;5Al\x1bj\x0c'),
+            ['a', '\x1b[1;5A', 'l', '\x1bj', '\x0c'])
+
+    def test_dispatch(self):
+        """Test that only bound key sequences call the hotkey callback."""
+        on_hotkey = MagicMock()
+        hotkeys = TerminalHotkeys(self.key_binds, on_hotkey)
+        hotkeys.dispatch('x\x0cj')
+        on_hotkey.assert_called_once_with('horizontal-rtl')
+
+    def test_wait_without_terminal(self):
+        """Test that waiting falls back to sleeping without a terminal."""
+        hotkeys = TerminalHotkeys(self.key_binds, MagicMock())
+        with patch('audio_visualizer.hotkeys.time.sleep') as mock_sleep:
+            hotkeys.wait(0.1)
+        mock_sleep.assert_called_once_with(0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+test_latency.py
+
+Latency regression tests using the synthetic source and capturing terminal
+in latency_harness.py.
+"""
+
+import unittest
+
+from tests.latency_harness import measure_latency, summarize
+
+
+class TestLatency(unittest.TestCase):
+    """
+    Test cases for the delay from the sound to the frame written.
+    """
+
+    def setUp(self):
+        self.chunk = 1024
+        self.rate = 44100
+        self.fps = 60
+        # An event waits at most one window to be captured and one frame
+        # interval to be drawn; the rest is margin for slow CI machines
+        self.budget = self.chunk / self.rate + 1 / self.fps + 0.05
+
+    def check_latency(self, **kwargs):
+        """Measures four events and checks every one is shown in time."""
+        latencies = measure_latency(chunk=self.chunk, rate=self.rate,
+                                    fps=self.fps, count=4, **kwargs)
+        self.assertEqual(latencies['missed'], 0)
+        # Frames come at the set rate, or as fast as windows are captured
+        self.assertGreater(latencies['fps'],
+                           0.8 * min(self.fps, self.rate / self.chunk))
+        summary = summarize(latencies)
+        capture, analysis, written = (
+            summary[stage][1] / 1000
+            for stage in ('capture', 'analysis', 'written'))
+        self.assertLessEqual(capture, analysis)
+        self.assertLessEqual(analysis, written)
+        self.assertLess(written, self.budget)
+
+    def test_latency_vertical(self):
+        """Test the latency of impulses in vertical mode."""
+        self.check_latency(mode='vertical')
+
+    def test_latency_horizontal_ltr(self):
+        """Test the latency of impulses in horizontal left-to-right mode."""
+        self.check_latency(mode='horizontal-ltr')
+
+    def test_latency_horizontal_rtl(self):
+        """Test the latency of tone bursts in horizontal right-to-left mode."""
+        self.check_latency(mode='horizontal-rtl', signal='tone')
+
+    def test_latency_waterfall(self):
+        """Test the latency of impulses in waterfall mode."""
+        self.check_latency(mode='waterfall')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+test_log_summary.py
+
+Unit tests for log_summary.py module.
+"""
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from audio_visualizer.log_summary import EventSummary
+
+
+class TestEventSummary(unittest.TestCase):
+    """
+    Test cases for aggregating repeated events into summaries.
+    """
+
+    @patch('audio_visualizer.log_summary.time.monotonic')
+    def test_summary_per_interval(self, mock_monotonic):
+        """Test that a burst of events is logged as one summary."""
+        mock_monotonic.return_value = 0
+        summary = EventSummary(interval=5.0)
+
+        with self.assertNoLogs(level='WARNING'):
+            for _ in range(100):
+                summary.record("Input overflowed", "overflow")
+
+        mock_monotonic.return_value = 5
+        with self.assertLogs(level='WARNING') as logs:
+            summary.record("Input overflowed", "overflow")
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("Input overflowed 101 times", logs.output[0])
+        self.assertEqual(summary.counts, {})
+
+    def test_flush(self):
+        """Test that flushing logs each event once at the given level."""
+        summary = EventSummary(level=logging.INFO)
+        summary.record("Input overflowed")
+        summary.record("Read without an open stream")
+        with self.assertLogs(level='INFO') as logs:
+            summary.flush()
+        self.assertEqual(len(logs.records), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
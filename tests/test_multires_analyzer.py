@@ -0,0 +1,110 @@
+"""
+test_multires_analyzer.py
+
+Unit tests for multires_analyzer.py module.
+"""
+
+import unittest
+import numpy as np
+
+from audio_visualizer.visualizer_logic.multires_analyzer import (
+    HalfBandDecimator, MultiResolutionAnalyzer, half_band_filter
+)
+
+
+def tone(frequency, count, rate):
+    """Returns a sine tone as int16-ranged samples."""
+    return np.sin(2 * np.pi * frequency * np.arange(count) / rate) * 10000
+
+
+def stereo(samples):
+    """Encodes mono samples as interleaved 16-bit stereo."""
+    samples = samples.astype(np.int16)
+    return np.vstack((samples, samples)).T.tobytes()
+
+
+class TestHalfBandDecimator(unittest.TestCase):
+    """
+    Test cases for decimating by two.
+    """
+
+    def test_filter(self):
+        """Test the filter gain and the accepted lengths."""
+        self.assertAlmostEqual(half_band_filter(23).sum() + 0.5, 1.0)
+        with self.assertRaises(ValueError):
+            half_band_filter(21)
+
+    def test_blocks(self):
+        """Test that blocks of any length give the same output."""
+        samples = np.random.default_rng(0).normal(size=3000)
+        expected = HalfBandDecimator(half_band_filter())(samples)
+        decimate = HalfBandDecimator(half_band_filter())
+        blocks = np.split(samples, [1, 4, 11, 511, 512, 2047])
+        output = np.concatenate([decimate(block) for block in blocks])
+        self.assertEqual(len(output), 1500)
+        np.testing.assert_allclose(output, expected)
+
+    def test_response(self):
+        """Test that the passband is kept and the stopband removed."""
+        decimate = HalfBandDecimator(half_band_filter())
+        passed = decimate(tone(0.1, 4000, 1))[100:]
+        decimate = HalfBandDecimator(half_band_filter())
+        stopped = decimate(tone(0.4, 4000, 1))[100:]
+        self.assertAlmostEqual(np.abs(passed).max() / 10000, 1.0, places=1)
+        self.assertLess(np.abs(stopped).max() / 10000, 0.01)
+
+
+class TestMultiResolutionAnalyzer(unittest.TestCase):
+    """
+    Test cases for the octave-by-octave analysis.
+    """
+
+    def setUp(self):
+        self.chunk = 2048
+        self.rate = 44100
+        self.analyzer = MultiResolutionAnalyzer(self.rate, octaves=8)
+
+    def test_bands(self):
+        """Test that the bands are log-spaced over the octaves."""
+        freqs = self.analyzer.freqs
+        self.assertEqual(len(self.analyzer), 12 * 9)
+        self.assertTrue(np.all(np.diff(freqs) > 0))
+        self.assertAlmostEqual(freqs[0], self.rate / 2 ** 10, delta=2)
+        self.assertLess(np.ptp(np.diff(np.log2(freqs))), 0.1)
+
+    def test_octaves(self):
+        """Test that at least one octave is required."""
+        for octaves in (0, -1):
+            with self.assertRaises(ValueError):
+                MultiResolutionAnalyzer(self.rate, octaves=octaves)
+        self.assertEqual(len(MultiResolutionAnalyzer(self.rate, octaves=1)),
+                         24)
+
+    def test_tones(self):
+        """Test that bass and treble tones peak in their bands."""
+        for frequency in (60, 440, 5000):
+            analyzer = MultiResolutionAnalyzer(self.rate, octaves=8)
+            samples = tone(frequency, 20 * self.chunk, self.rate)
+            for block in np.split(samples, 20):
+                bands = analyzer(stereo(block))
+            peak = analyzer.freqs[np.argmax(bands)]
+            self.assertAlmostEqual(np.log2(peak / frequency), 0, delta=0.05)
+
+    def test_transients(self):
+        """Test that a click shows in the treble wherever it falls."""
+        peaks = []
+        for position in (100, 1000):
+            analyzer = MultiResolutionAnalyzer(self.rate, octaves=8)
+            for _ in range(3):
+                analyzer(stereo(np.zeros(self.chunk)))
+            click = np.zeros(self.chunk)
+            click[position:position + 40] = tone(
+                self.rate / 3, 40, self.rate)
+            bands = analyzer(stereo(click))
+            peaks.append(bands[analyzer.freqs > self.rate / 8].max())
+        self.assertGreater(peaks[0], 0.5 * peaks[1])
+        self.assertGreater(peaks[0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
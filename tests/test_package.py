@@ -0,0 +1,40 @@
+"""
+test_package.py
+
+Unit tests for importing the audio_visualizer package.
+"""
+
+import subprocess
+import sys
+import unittest
+
+# Configures logging like a host program, imports the package with
+# --version in argv and prints what the package left behind
+HOST_SCRIPT = """
+import logging
+import sys
+logging.basicConfig(level=logging.WARNING)
+handlers = list(logging.root.handlers)
+import audio_visualizer
+print(logging.root.handlers == handlers, logging.root.level, flush=True)
+logging.warning("host warning")
+"""
+
+
+class TestPackage(unittest.TestCase):
+    """
+    Test cases for embedding the package in other programs.
+    """
+
+    def test_import_leaves_host_alone(self):
+        """Test that importing the package keeps the host's logging."""
+        result = subprocess.run(
+            [sys.executable, '-c', HOST_SCRIPT, '--version'],
+            capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ['True', '30'])
+        self.assertIn("host warning", result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+test_pcm_source.py
+
+Unit tests for pcm_source.py module.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+import numpy as np
+
+from audio_visualizer.pcm_source import PCMSource, open_source
+from audio_visualizer.visualizer_logic.audio_processing import (
+    compute_spectrum
+)
+
+
+@unittest.skipUnless(hasattr(os, 'mkfifo'), "Named pipes need POSIX")
+class TestPCMSource(unittest.TestCase):
+    """
+    Test cases for reading raw PCM audio from a pipe.
+    """
+
+    def setUp(self):
+        self.chunk = 256
+        self.rate = 44100
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'audio')
+        os.mkfifo(self.path)
+        self.writer = None
+
+    def tearDown(self):
+        if self.writer is not None:
+            os.close(self.writer)
+        self.directory.cleanup()
+
+    def open(self, **kwargs):
+        """Opens a source on the pipe and connects a writer to it."""
+        source = PCMSource(self.path, self.chunk, self.rate, timeout=0.05,
+                           **kwargs)
+        source.start_stream()
+        self.addCleanup(source.stop_stream)
+        self.writer = os.open(self.path, os.O_WRONLY)
+        return source
+
+    def chunks(self, count, channels=2):
+        """Returns count chunks of distinct 16-bit samples."""
+        samples = np.arange(count * self.chunk * channels) % 30000
+        return samples.astype('<i2').reshape(count, self.chunk, channels)
+
+    def test_newest_chunk(self):
+        """Test that the newest complete chunk is read without a copy."""
+        source = self.open()
+        chunks = self.chunks(3)
+        os.write(self.writer, chunks.tobytes() + b'\0\0')
+        data = source.read_data()
+        np.testing.assert_array_equal(data, chunks[2])
+        self.assertTrue(np.shares_memory(
+            data, np.frombuffer(source.buffer, dtype=np.uint8)))
+
+    def test_partial_chunk(self):
+        """Test that a read waits until a chunk is complete."""
+        source = self.open()
+        payload = self.chunks(1).tobytes()
+        os.write(self.writer, payload[:100])
+        self.assertIsNone(source.read_data())
+        os.write(self.writer, payload[100:])
+        np.testing.assert_array_equal(source.read_data(), self.chunks(1)[0])
+
+    def test_overflow(self):
+        """Test that audio older than the buffer is dropped."""
+        source = self.open(buffer_chunks=2)
+        chunks = self.chunks(9)
+        os.write(self.writer, chunks.tobytes())
+        np.testing.assert_array_equal(source.read_data(), chunks[8])
+
+    def test_formats(self):
+        """Test that samples are scaled to the 16-bit range."""
+        source = self.open(channels=1, sample_format='f32le')
+        os.write(self.writer, np.full(self.chunk, 0.5, '<f4').tobytes())
+        data = source.read_data()
+        self.assertEqual(data.shape, (self.chunk, 1))
+        np.testing.assert_allclose(data, 16384)
+        with self.assertRaises(ValueError):
+            PCMSource(self.path, self.chunk, self.rate, sample_format='s24')
+
+    def test_analysis(self):
+        """Test that read chunks analyze like bytes from a device."""
+        source = self.open()
+        payload = self.chunks(1).tobytes()
+        os.write(self.writer, payload)
+        window = np.hamming(self.chunk)
+        np.testing.assert_allclose(
+            compute_spectrum(source.read_data(), window),
+            compute_spectrum(payload, window))
+
+    @patch('audio_visualizer.backoff.time.sleep')
+    def test_end_of_stream(self, mock_sleep):
+        """Test that reads back off once the writer has gone."""
+        source = self.open()
+        os.close(self.writer)
+        self.writer = None
+        self.assertIsNone(source.read_data())
+        self.assertIsNone(source.read_data())
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(source.backoff.delay, 0.2)
+
+    @patch('audio_visualizer.backoff.time.sleep')
+    def test_read_failure(self, mock_sleep):
+        """Test that reads back off while the pipe fails."""
+        source = self.open()
+        with patch.object(source.file, 'readinto',
+                          side_effect=OSError(5, 'Input/output error')):
+            self.assertIsNone(source.read_data())
+            self.assertIsNone(source.read_data())
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(source.read_errors.counts['Read failed'], 2)
+
+    def test_stdin(self):
+        """Test reading from stdin."""
+        reader, writer = os.pipe()
+        self.addCleanup(os.close, reader)
+        self.addCleanup(os.close, writer)
+        stdin = MagicMock()
+        stdin.fileno.return_value = reader
+        with patch('sys.stdin', stdin):
+            source = open_source('-', self.chunk, self.rate)
+            source.start_stream()
+            os.write(writer, self.chunks(1).tobytes())
+            np.testing.assert_array_equal(
+                source.read_data(), self.chunks(1)[0])
+            source.stop_stream()
+        self.assertTrue(os.get_blocking(reader))
+
+    def test_open_source(self):
+        """Test that sources are chosen by name."""
+        source = open_source(f'fifo:{self.path}', self.chunk, self.rate,
+                             channels=1, sample_format='s32le')
+        self.assertIsInstance(source, PCMSource)
+        self.assertEqual(source.path, self.path)
+        self.assertEqual(source.chunk_bytes, self.chunk * 4)
+
+    def test_open_device_without_pyaudio(self):
+        """Test that a device source explains how to install PyAudio."""
+        with patch.dict('sys.modules',
+                        {'audio_visualizer.audio_capture': None}):
+            with self.assertRaisesRegex(ImportError, r'\[device\]'):
+                open_source('Microphone', self.chunk, self.rate)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+test_spectrum_analyzer.py
+
+Unit tests for spectrum_analyzer.py module.
+"""
+
+import unittest
+from unittest.mock import patch
+import numpy as np
+
+from audio_visualizer.visualizer_logic.audio_processing import (
+    compute_spectrum
+)
+from audio_visualizer.visualizer_logic.spectrum_analyzer import (
+    SpectrumAnalyzer, frequency_bins
+)
+
+
+class TestSpectrumAnalyzer(unittest.TestCase):
+    """
+    Test cases for computing a subset of the FFT bins.
+    """
+
+    def setUp(self):
+        self.chunk = 2048
+        self.rate = 44100
+        self.window = np.hamming(self.chunk)
+
+        # Simulate some audio data (bass and treble sine waves)
+        t = np.arange(self.chunk) / self.rate
+        wave = (np.sin(2 * np.pi * 60 * t) * 16000
+                + np.sin(2 * np.pi * 5000 * t) * 8000).astype(np.int16)
+        self.audio_data = np.vstack((wave, wave)).T.tobytes()
+        self.spectrum = compute_spectrum(self.audio_data, self.window)
+
+    def test_frequency_bins(self):
+        """Test that the bins cover the requested frequency range."""
+        bins = frequency_bins(self.chunk, self.rate, max_freq=250)
+        self.assertEqual(bins[0], 0)
+        self.assertGreaterEqual(bins[-1] * self.rate / self.chunk, 250)
+        self.assertEqual(len(frequency_bins(self.chunk, self.rate)),
+                         self.chunk // 2 + 1)
+
+    def test_strategies_agree(self):
+        """Test that the DFT and FFT compute the same bins."""
+        bins = frequency_bins(self.chunk, self.rate, 40, 250)
+        for strategy in ('dft', 'fft'):
+            analyzer = SpectrumAnalyzer(self.window, bins, strategy=strategy)
+            np.testing.assert_allclose(
+                analyzer(self.audio_data), self.spectrum[bins],
+                rtol=1e-6, atol=1e-3)
+
+    def test_full_spectrum_uses_fft(self):
+        """Test that the full spectrum is computed with a single FFT."""
+        analyzer = SpectrumAnalyzer(self.window)
+        self.assertEqual(analyzer.strategy, 'fft')
+        self.assertIsNone(analyzer.matrix)
+        np.testing.assert_allclose(analyzer(self.audio_data), self.spectrum)
+
+    @patch('audio_visualizer.visualizer_logic.spectrum_analyzer.dft_matrix')
+    def test_wide_range_uses_fft(self, mock_dft_matrix):
+        """Test that a wide range is not timed against the DFT."""
+        analyzer = SpectrumAnalyzer(
+            self.window, np.arange(1, self.chunk // 2 + 1))
+        self.assertEqual(analyzer.strategy, 'fft')
+        mock_dft_matrix.assert_not_called()
+
+    def test_strategy_is_measured(self):
+        """Test that a strategy is picked for a few bins."""
+        analyzer = SpectrumAnalyzer(self.window, np.arange(1, 5))
+        self.assertIn(analyzer.strategy, ('dft', 'fft'))
+        self.assertEqual(analyzer.matrix is not None,
+                         analyzer.strategy == 'dft')
+
+
+if __name__ == '__main__':
+    unittest.main()
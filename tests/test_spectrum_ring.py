@@ -0,0 +1,49 @@
+"""
+test_spectrum_ring.py
+
+Unit tests for spectrum_ring.py module.
+"""
+
+import unittest
+import numpy as np
+
+from audio_visualizer.visualizer_logic.spectrum_ring import SpectrumRing
+
+
+class TestSpectrumRing(unittest.TestCase):
+    """
+    Test cases for passing spectra through the shared memory ring.
+    """
+
+    def setUp(self):
+        self.frame_size = 1025
+        self.writer = SpectrumRing.create(self.frame_size, slots=4)
+        self.reader = SpectrumRing.attach(
+            self.writer.shm.name, self.frame_size, slots=4)
+        self.out = np.zeros(self.frame_size, dtype=np.float32)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.writer.unlink()
+
+    def test_empty_ring(self):
+        """Test that nothing is read before the first write."""
+        self.assertEqual(self.reader.read_latest(self.out), 0)
+
+    def test_read_latest(self):
+        """Test that the reader skips to the newest frame."""
+        for value in range(1, 7):
+            self.writer.write(np.full(self.frame_size, value))
+        sequence = self.reader.read_latest(self.out)
+        self.assertEqual(sequence, 6)
+        self.assertTrue(np.all(self.out == 6))
+        self.assertEqual(self.reader.read_latest(self.out, sequence), 0)
+
+        self.writer.write(np.full(self.frame_size, 7))
+        self.assertEqual(self.reader.read_latest(self.out, sequence), 7)
+        self.assertTrue(np.all(self.out == 7))
+
+
+if __name__ == '__main__':
+    unittest.main()
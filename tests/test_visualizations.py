@@ -6,7 +6,6 @@ and horizontal_right_to_left_visualizer modules.
 """
 
 import unittest
-import sys
 from unittest.mock import MagicMock, patch
 import numpy as np
 from threading import Event
@@ -16,12 +15,9 @@ from audio_visualizer.visualizer_logic.audio_processing import (
     process_audio_visualization
 )
 from audio_visualizer.visualizer_logic.visualizer_drawer import (
-    draw_horizontal_ltr, draw_horizontal_rtl, draw_vertical
+    WaterfallDrawer, draw_horizontal_ltr, draw_horizontal_rtl, draw_vertical
 )
 
-sys.modules['pynput'] = MagicMock()
-sys.modules['pynput.keyboard'] = MagicMock()
-
 
 # Mocking os.system to prevent clearing the screen
 @patch('os.system')
@@ -42,9 +38,9 @@ class TestVisualizations(unittest.TestCase):
         # Simulate some audio data (sine wave)
         t = np.linspace(0, self.chunk / self.rate, self.chunk)
         sine_wave = (np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
-        audio_data = np.vstack((sine_wave, sine_wave)
-                               ).T.tobytes()  # Create stereo data
-        self.stream.read_data.side_effect = [audio_data, None]
+        self.audio_data = np.vstack((sine_wave, sine_wave)
+                                    ).T.tobytes()  # Create stereo data
+        self.stream.read_data.side_effect = [self.audio_data, None]
 
     def test_visualize_vertical(self, mock_get_terminal_size, mock_system):
         """Test visualizing audio data vertically."""
@@ -99,6 +95,33 @@ class TestVisualizations(unittest.TestCase):
         self.assertIn('█', output)
         self.assertGreater(len(output), 0)
 
+    def test_visualize_waterfall(self, mock_get_terminal_size, mock_system):
+        """Test that the waterfall only writes one row after the first."""
+        self.mock_stop_event.is_set.side_effect = [False, False, True]
+        self.stream.read_data.side_effect = [self.audio_data] * 2
+        with patch('sys.stdout', new=io.StringIO()) as fake_stdout:
+            process_audio_visualization(
+                stream=self.stream,
+                chunk=self.chunk,
+                rate=self.rate,
+                alpha=self.alpha,
+                window=self.window,
+                stop_event=self.mock_stop_event,
+                draw_function=WaterfallDrawer(),
+                theme=self.theme,
+                wait_function=MagicMock()
+            )
+            output = fake_stdout.getvalue()
+        mock_system.assert_not_called()
+        first, second = output.split('\033[0m')[:2]
+        # The first frame sets the scroll region and draws every row
+        self.assertIn('\033[1;80r', first)
+        self.assertEqual(first.count('\n'), 79)
+        # Later frames scroll by one line and draw only the new row
+        self.assertTrue(second.startswith('\033[80;1H\n'))
+        self.assertEqual(len(second), len('\033[80;1H\n') + 24)
+        self.assertIn('█', second)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,59 @@
+"""
+test_visualizer.py
+
+Unit tests for visualizer.py module.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from audio_visualizer.visualizer import AudioVisualizer
+
+
+class TestAudioVisualizer(unittest.TestCase):
+    """
+    Test cases for running the analysis in a separate process.
+    """
+
+    @patch('audio_visualizer.visualizer.TerminalHotkeys')
+    def test_analysis_process_logs(self, _):
+        """Test that records logged by the analysis process are handled."""
+        with tempfile.TemporaryDirectory() as directory:
+            missing = os.path.join(directory, 'missing')
+            visualizer = AudioVisualizer(
+                'vertical', 0.4, 1024, 44100, {},
+                audio_source=f'fifo:{missing}', processes=True)
+            with self.assertLogs(level='ERROR') as logs:
+                visualizer.start_analysis_process()
+                visualizer.stop_analysis_process()
+        self.assertTrue(any(f"Failed to open {missing}" in line
+                            for line in logs.output), logs.output)
+
+    @patch('audio_visualizer.visualizer.TerminalHotkeys')
+    def test_analysis_process_exit(self, MockHotkeys):
+        """Test that rendering stops when the analysis process fails."""
+        MockHotkeys.return_value.wait.side_effect = time.sleep
+        with tempfile.TemporaryDirectory() as directory:
+            # The format is only checked when the process opens the source
+            visualizer = AudioVisualizer(
+                'vertical', 0.4, 1024, 44100, {},
+                audio_source=f"fifo:{os.path.join(directory, 'audio')}",
+                processes=True, sample_format='s24')
+            with self.assertLogs(level='ERROR') as logs:
+                visualizer.start_analysis_process()
+                visualizer.restart_visualization()
+                visualizer.thread.join(timeout=30)
+                self.assertFalse(visualizer.is_running())
+                visualizer.stop_analysis_process()
+        self.assertEqual(visualizer.analysis_process.exitcode, 1)
+        self.assertTrue(any("Unsupported sample format" in line
+                            for line in logs.output), logs.output)
+        self.assertTrue(any("Analysis process exited" in line
+                            for line in logs.output), logs.output)
+
+
+if __name__ == '__main__':
+    unittest.main()